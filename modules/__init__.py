@@ -1,25 +1,31 @@
 """功能模块"""
 
-from .image_module import RandomImageAction, RandomImageCommand
-from .news_module import News60sTool, TodayInHistoryTool, NewsCommand, HistoryCommand
-from .music_module import MusicCommand, ChooseCommand, QuickChooseCommand
-from .ai_draw_module import AIDrawCommand
-from .auto_image_tool import AIDrawTool
+import importlib
 
-__all__ = [
+# 组件名 -> 所在子模块（首次访问时才导入，未启用的模块不会被加载）
+_EXPORTS = {
     # 图片模块
-    'RandomImageAction',
-    'RandomImageCommand',
+    'RandomImageAction': '.image_module',
+    'RandomImageCommand': '.image_module',
     # 新闻模块
-    'News60sTool',
-    'TodayInHistoryTool',
-    'NewsCommand',
-    'HistoryCommand',
+    'News60sTool': '.news_module',
+    'TodayInHistoryTool': '.news_module',
+    'NewsCommand': '.news_module',
+    'HistoryCommand': '.news_module',
     # 音乐模块
-    'MusicCommand',
-    'ChooseCommand',
-    'QuickChooseCommand',
+    'MusicCommand': '.music_module',
+    'ChooseCommand': '.music_module',
+    'QuickChooseCommand': '.music_module',
     # AI绘图模块
-    'AIDrawCommand',
-    'AIDrawTool',
-]
+    'AIDrawCommand': '.ai_draw_module',
+    'AIDrawTool': '.auto_image_tool',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
@@ -17,6 +17,7 @@ import time
 from typing import Tuple, List, Dict, Optional
 from src.common.logger import get_logger
 from src.plugin_system.base.base_command import BaseCommand
+from ..utils.api_client import get_shared_session, json_loads
 
 logger = get_logger("entertainment_plugin.ai_draw")
 
@@ -316,43 +317,43 @@ class AIDrawCommand(BaseCommand):
             logger.info(f"执行AI绘图命令,描述词: {prompt}, 选择模式: {selection_mode}")
 
             # 调用API获取图片数据
-            async with aiohttp.ClientSession() as session:
-                async with session.get(full_api_url, timeout=timeout) as response:
-                    if response.status != 200:
-                        raise Exception(f"API请求失败,状态码: {response.status}")
-
-                    data = await response.json()
-
-                    if data.get("code") != 200:
-                        raise Exception(f"API返回错误: {data.get('msg', '未知错误')}")
-
-                    images = data.get("data", [])
-                    if not images:
-                        raise Exception("API返回的图片列表为空")
-
-                    logger.info(f"API返回 {len(images)} 张图片")
-
-                    # 根据配置选择图片
-                    selected_images, selected_idx = select_best_image(prompt, images, selection_mode)
-
-                    # 缓存所有图片（用于"下一张"功能）
-                    chat_id = self.message.chat_stream.stream_id if self.message and self.message.chat_stream else None
-                    if chat_id:
-                        await cache_images(chat_id, images, prompt, selected_idx)
-                        logger.debug(f"已缓存 {len(images)} 张图片，可用于换风格")
-
-                    # 发送图片
-                    for idx, img_data in enumerate(selected_images):
-                        img_url = img_data.get("url")
-                        if img_url:
-                            await self.send_custom("imageurl", img_url)
-                            creation_prompt = img_data.get("creation_prompt", "")
-                            logger.info(
-                                f"发送AI绘图 [{idx+1}/{len(selected_images)}] "
-                                f"创作提示: {creation_prompt[:50]}..."
-                            )
-
-                    return True, f"成功生成并发送 {len(selected_images)} 张AI图片 (描述词: {prompt})", True
+            session = get_shared_session()
+            async with session.get(full_api_url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status != 200:
+                    raise Exception(f"API请求失败,状态码: {response.status}")
+
+                data = json_loads(await response.read())
+
+            if data.get("code") != 200:
+                raise Exception(f"API返回错误: {data.get('msg', '未知错误')}")
+
+            images = data.get("data", [])
+            if not images:
+                raise Exception("API返回的图片列表为空")
+
+            logger.info(f"API返回 {len(images)} 张图片")
+
+            # 根据配置选择图片
+            selected_images, selected_idx = select_best_image(prompt, images, selection_mode)
+
+            # 缓存所有图片（用于"下一张"功能）
+            chat_id = self.message.chat_stream.stream_id if self.message and self.message.chat_stream else None
+            if chat_id:
+                await cache_images(chat_id, images, prompt, selected_idx)
+                logger.debug(f"已缓存 {len(images)} 张图片，可用于换风格")
+
+            # 发送图片
+            for idx, img_data in enumerate(selected_images):
+                img_url = img_data.get("url")
+                if img_url:
+                    await self.send_custom("imageurl", img_url)
+                    creation_prompt = img_data.get("creation_prompt", "")
+                    logger.info(
+                        f"发送AI绘图 [{idx+1}/{len(selected_images)}] "
+                        f"创作提示: {creation_prompt[:50]}..."
+                    )
+
+            return True, f"成功生成并发送 {len(selected_images)} 张AI图片 (描述词: {prompt})", True
 
         except Exception as e:
             logger.error(f"AI绘图命令执行出错: {e}")
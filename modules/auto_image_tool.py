@@ -12,6 +12,7 @@ from src.plugin_system.base.base_tool import BaseTool
 from src.plugin_system.base.component_types import ToolParamType
 from src.config.config import global_config
 from src.plugin_system.apis import send_api
+from ..utils.api_client import get_shared_session, json_loads
 
 logger = get_logger("entertainment_plugin.ai_draw_tool")
 
@@ -179,60 +180,60 @@ class AIDrawTool(BaseTool):
         # 调用API
         try:
             timeout_obj = aiohttp.ClientTimeout(total=timeout, connect=10, sock_read=timeout)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(full_api_url, timeout=timeout_obj) as response:
-                    if response.status != 200:
-                        raise Exception(f"API请求失败，状态码: {response.status}")
+            session = get_shared_session()
+            async with session.get(full_api_url, timeout=timeout_obj) as response:
+                if response.status != 200:
+                    raise Exception(f"API请求失败，状态码: {response.status}")
 
-                    data = await response.json()
+                data = json_loads(await response.read())
 
-                    if data.get("code") != 200:
-                        raise Exception(f"API返回错误: {data.get('msg', '未知错误')}")
+            if data.get("code") != 200:
+                raise Exception(f"API返回错误: {data.get('msg', '未知错误')}")
 
-                    images = data.get("data", [])
-                    if not images:
-                        raise Exception("API返回的图片列表为空")
+            images = data.get("data", [])
+            if not images:
+                raise Exception("API返回的图片列表为空")
 
-                    logger.info(f"API返回 {len(images)} 张图片")
+            logger.info(f"API返回 {len(images)} 张图片")
 
-                    # 选择最佳图片（使用优化的算法）
-                    from .ai_draw_module import select_best_image, cache_images
-                    selected_images, selected_idx = select_best_image(prompt, images, selection_mode)
+            # 选择最佳图片（使用优化的算法）
+            from .ai_draw_module import select_best_image, cache_images
+            selected_images, selected_idx = select_best_image(prompt, images, selection_mode)
 
-                    if not selected_images:
-                        raise Exception("未能选择到有效图片")
+            if not selected_images:
+                raise Exception("未能选择到有效图片")
 
-                    # 缓存所有图片（用于换风格功能）
-                    await cache_images(self.chat_id, images, prompt, selected_idx)
+            # 缓存所有图片（用于换风格功能）
+            await cache_images(self.chat_id, images, prompt, selected_idx)
 
-                    # 发送图片
-                    img_url = selected_images[0].get("url")
-                    if img_url:
-                        # Tool应该使用SendAPI发送消息
-                        if self.chat_stream:
-                            await send_api.custom_to_stream("imageurl", img_url, self.chat_stream.stream_id)
+            # 发送图片
+            img_url = selected_images[0].get("url")
+            if img_url:
+                # Tool应该使用SendAPI发送消息
+                if self.chat_stream:
+                    await send_api.custom_to_stream("imageurl", img_url, self.chat_stream.stream_id)
 
-                        creation_prompt = selected_images[0].get("creation_prompt", "")
+                creation_prompt = selected_images[0].get("creation_prompt", "")
 
-                        logger.info(
-                            f"{'自动配图' if is_auto_scene else '主动画图'}成功 "
-                            f"创作提示: {creation_prompt[:50]}..."
-                        )
+                logger.info(
+                    f"{'自动配图' if is_auto_scene else '主动画图'}成功 "
+                    f"创作提示: {creation_prompt[:50]}..."
+                )
 
-                        remaining = len(images) - 1 if selection_mode == "best" else 0
-                        if remaining > 0:
-                            logger.info(f"还有{remaining}张其他风格可用")
+                remaining = len(images) - 1 if selection_mode == "best" else 0
+                if remaining > 0:
+                    logger.info(f"还有{remaining}张其他风格可用")
 
-                        result_msg = f"{'配图' if is_auto_scene else '绘图'}成功 (描述: {prompt})"
-                        if remaining > 0 and not is_auto_scene:
-                            result_msg += f"，还有{remaining}张其他风格可换"
+                result_msg = f"{'配图' if is_auto_scene else '绘图'}成功 (描述: {prompt})"
+                if remaining > 0 and not is_auto_scene:
+                    result_msg += f"，还有{remaining}张其他风格可换"
 
-                        return {
-                            "name": self.name,
-                            "content": result_msg
-                        }
-                    else:
-                        raise Exception("图片URL为空")
+                return {
+                    "name": self.name,
+                    "content": result_msg
+                }
+            else:
+                raise Exception("图片URL为空")
 
         except aiohttp.ClientError as e:
             logger.error(f"网络请求错误: {e}")
@@ -10,25 +10,45 @@
 - 自动缓存管理
 """
 
-import aiohttp
 import asyncio
+import random
 import time
+from collections import namedtuple
+from functools import cached_property, lru_cache, partial
 from typing import Tuple, Optional, List, Any, Dict
 from src.common.logger import get_logger
 from src.plugin_system.base.base_tool import BaseTool, ToolParamType
 from src.plugin_system.base.base_command import BaseCommand
+from src.plugin_system.base.component_types import CommandInfo, ComponentType
 from src.plugin_system.apis import send_api
 from ..utils.api_client import AsyncAPIClient
-from ..utils.image_generator import generate_music_list_image, generate_music_list_text
+from ..utils.image_generator import generate_music_list_image_async, generate_music_list_text
+from ..utils.ttl_cache import TTLCache
 
 logger = get_logger("entertainment_plugin.music")
 
+# 用户未指定歌名时随机推荐的热门歌曲
+_DEFAULT_SONGS = (
+    "水星记", "起风了", "光年之外", "稻香", "晴天",
+    "告白气球", "青花瓷", "七里香", "遇见", "演员"
+)
+
 
 # ===== 全局搜索缓存 =====
-_search_cache: Dict[str, dict] = {}
-_search_cache_lock = asyncio.Lock()  # 缓存并发保护
 _CACHE_TTL = 60  # 60秒（与快捷选择超时时间保持一致）
-_cache_cleanup_task: Optional[asyncio.Task] = None
+_search_cache = TTLCache(maxsize=1000, ttl=_CACHE_TTL, lru=False)  # 统一TTL，按写入顺序过期
+_search_cache_lock = asyncio.Lock()  # 缓存并发保护
+_cache_expire_timer: Optional[asyncio.TimerHandle] = None  # 下一次过期检查的定时器
+_cache_expire_task: Optional[asyncio.Task] = None
+
+
+async def _disable_choose_commands():
+    """所有搜索缓存都已清空时，禁用快捷选择命令"""
+    from src.plugin_system.core.component_registry import component_registry
+
+    await component_registry.disable_component("quick_choose", ComponentType.COMMAND)
+    await component_registry.disable_component("choose", ComponentType.COMMAND)
+    logger.info("已动态禁用快捷选择命令（无搜索缓存）")
 
 
 async def get_search_cache(key: str) -> Optional[dict]:
@@ -52,24 +72,18 @@ async def get_search_cache(key: str) -> Optional[dict]:
         - timestamp: 缓存时间戳
     """
     async with _search_cache_lock:
-        if key in _search_cache:
-            cache_data = _search_cache[key]
-            if time.time() - cache_data.get("timestamp", 0) < _CACHE_TTL:
-                return cache_data
-            else:
-                # 过期，删除缓存
-                del _search_cache[key]
-                logger.debug(f"缓存已过期并删除: {key}")
+        if key not in _search_cache:
+            return None
 
-                # 如果所有缓存都已清空，禁用快捷选择命令
-                if len(_search_cache) == 0:
-                    from src.plugin_system.core.component_registry import component_registry
-                    from src.plugin_system.base.component_types import ComponentType
+        cache_data = _search_cache.get(key)
+        if cache_data is None:
+            # 过期，get 已删除缓存
+            logger.debug("缓存已过期并删除: %s", key)
 
-                    await component_registry.disable_component("quick_choose", ComponentType.COMMAND)
-                    await component_registry.disable_component("choose", ComponentType.COMMAND)
-                    logger.info("已动态禁用快捷选择命令（无搜索缓存）")
-        return None
+            # 如果所有缓存都已清空，禁用快捷选择命令
+            if not _search_cache:
+                await _disable_choose_commands()
+        return cache_data
 
 
 async def set_search_cache(key: str, keyword: str, results: List[dict], source: str = "netease"):
@@ -81,6 +95,7 @@ async def set_search_cache(key: str, keyword: str, results: List[dict], source:
     - 自动记录时间戳用于TTL检查
     - 支持多音乐源缓存
     - 自动动态启用QuickChooseCommand和ChooseCommand
+    - 按需安排过期检查定时器（无周期轮询）
 
     Args:
         key: 缓存键（如"music_search_group_123"）
@@ -89,155 +104,259 @@ async def set_search_cache(key: str, keyword: str, results: List[dict], source:
         source: 音乐源（netease/qq/netease_vip/qq_vip/juhe）
     """
     async with _search_cache_lock:
-        is_first_cache = len(_search_cache) == 0
+        is_first_cache = not _search_cache
 
-        _search_cache[key] = {
+        _search_cache.set(key, {
             "keyword": keyword,
             "results": results,
             "source": source,
             "timestamp": time.time()
-        }
-        logger.debug(f"缓存已设置: {key}, 关键词={keyword}, 结果数={len(results)}")
+        })
+        logger.debug("缓存已设置: %s, 关键词=%s, 结果数=%d", key, keyword, len(results))
 
         # 如果是第一个缓存，动态启用快捷选择命令
         if is_first_cache:
             from src.plugin_system.core.component_registry import component_registry
-            from src.plugin_system.base.component_types import ComponentType
 
             component_registry.enable_component("quick_choose", ComponentType.COMMAND)
             component_registry.enable_component("choose", ComponentType.COMMAND)
             logger.info("已动态启用快捷选择命令（有搜索缓存）")
 
+        # 已有定时器时无需重排：它对应的是更早写入、更早过期的缓存
+        if _cache_expire_timer is None:
+            _schedule_cache_expiry(_CACHE_TTL)
 
-async def _cleanup_expired_cache():
-    """后台任务：定期清理过期缓存，自动禁用命令"""
-    while True:
-        try:
-            await asyncio.sleep(60)  # 每1分钟检查一次
 
-            async with _search_cache_lock:
-                current_time = time.time()
-                expired_keys = [
-                    key for key, data in _search_cache.items()
-                    if current_time - data.get("timestamp", 0) >= _CACHE_TTL
-                ]
+def _schedule_cache_expiry(delay: float):
+    """在 delay 秒后触发一次过期清理（取代每分钟轮询的后台任务）"""
+    global _cache_expire_timer
+    if _cache_expire_timer is not None:
+        _cache_expire_timer.cancel()
+    loop = asyncio.get_running_loop()
+    _cache_expire_timer = loop.call_later(delay, _on_cache_expire_timer)
 
-                for key in expired_keys:
-                    del _search_cache[key]
 
-                if expired_keys:
-                    logger.info(f"清理了 {len(expired_keys)} 个过期缓存")
+def _on_cache_expire_timer():
+    """定时器回调：在事件循环中启动过期清理"""
+    global _cache_expire_task
+    _cache_expire_task = asyncio.create_task(_expire_search_cache())
 
-                    # 如果所有缓存都已清空，禁用快捷选择命令
-                    if len(_search_cache) == 0:
-                        from src.plugin_system.core.component_registry import component_registry
-                        from src.plugin_system.base.component_types import ComponentType
 
-                        await component_registry.disable_component("quick_choose", ComponentType.COMMAND)
-                        await component_registry.disable_component("choose", ComponentType.COMMAND)
-                        logger.info("已动态禁用快捷选择命令（无搜索缓存）")
+async def _expire_search_cache():
+    """清理过期缓存；仍有缓存时按最早过期时间重新安排，否则禁用命令"""
+    global _cache_expire_timer
+    try:
+        async with _search_cache_lock:
+            _cache_expire_timer = None
+            evicted = _search_cache.evict_expired()
+
+            if evicted:
+                logger.info(f"清理了 {evicted} 个过期缓存")
+
+            if _search_cache:
+                _schedule_cache_expiry(max(0.0, _search_cache.next_expiry() - time.time()))
+            elif evicted:
+                # 如果所有缓存都已清空，禁用快捷选择命令
+                await _disable_choose_commands()
+
+    except Exception as e:
+        logger.error(f"缓存清理任务出错: {e}", exc_info=True)
+
+
+# ===== 共享 API 客户端 =====
+_shared_clients: Dict[int, AsyncAPIClient] = {}
+
+
+def _get_shared_client(timeout: int) -> AsyncAPIClient:
+    """按超时时间复用 AsyncAPIClient（底层共享同一个连接池）"""
+    client = _shared_clients.get(timeout)
+    if client is None:
+        client = AsyncAPIClient(timeout)
+        _shared_clients[timeout] = client
+    return client
 
-        except asyncio.CancelledError:
-            logger.debug("缓存清理任务被取消")
-            break
-        except Exception as e:
-            logger.error(f"缓存清理任务出错: {e}", exc_info=True)
 
+# ===== 搜索结果缓存 =====
+# {(source, 规范化关键词, num): music_list}，不同用户搜索同一首热门歌曲时直接复用
+_list_cache = TTLCache(maxsize=256, ttl=600)
 
-def start_cache_cleanup():
-    """启动缓存清理任务"""
-    global _cache_cleanup_task
-    if _cache_cleanup_task is None or _cache_cleanup_task.done():
-        _cache_cleanup_task = asyncio.create_task(_cleanup_expired_cache())
-        logger.info("缓存清理任务已启动")
+# ===== 歌曲详情缓存 =====
+# {(source, keyword, choose): music_info}，10分钟TTL（播放链接有时效，不宜缓存过久）
+_detail_cache = TTLCache(maxsize=1000, ttl=600)
+# 进行中的详情请求 {key: [task, 等待者数量]}，合并预取与用户选择发起的相同请求
+_detail_inflight: Dict[tuple, list] = {}
+
+
+def _on_detail_done(key: tuple, task: asyncio.Task):
+    """详情请求结束：移出进行中列表（只移除本任务对应的条目）"""
+    entry = _detail_inflight.get(key)
+    if entry is not None and entry[0] is task:
+        del _detail_inflight[key]
+
+
+# ===== 后台任务 =====
+_background_tasks: set = set()  # 持有后台任务的强引用，防止任务未完成即被回收
+
+
+def _run_in_background(coro):
+    """在后台运行协程，不等待结果"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
+
+
+def _on_background_task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("后台任务失败: %s", task.exception())
+
+# ===== 封面图片缓存 =====
+# {cover_url: base64_image}
+# 封面下载上限 2MB；只缓存 base64 不超过 512KB 的封面（常见缩略图），缓存总量不超过约 25MB
+_COVER_MAX_SIZE = 2 * 1024 * 1024
+_COVER_CACHE_ITEM_MAX = 512 * 1024
+_cover_cache = TTLCache(maxsize=50, ttl=3600)
+
+
+async def _get_cover_base64(cover: str, timeout: int) -> Optional[str]:
+    """
+    获取封面图片的base64编码（小图带缓存，大图每次重新下载）
+
+    Args:
+        cover: 封面URL
+        timeout: 下载超时时间（秒）
+
+    Returns:
+        base64编码的图片或None
+    """
+    base64_image = _cover_cache.get(cover)
+    if base64_image is not None:
+        return base64_image
+
+    base64_image = await _get_shared_client(timeout).download_image_base64(
+        cover, max_size=_COVER_MAX_SIZE, log_prefix="[Cover]"
+    )
+    if base64_image and len(base64_image) <= _COVER_CACHE_ITEM_MAX:
+        _cover_cache.set(cover, base64_image)
+    return base64_image
 
 
 # ===== 公共音乐发送函数 =====
 
-async def send_music_info_to_command(
-    component,
+# 标准化音乐信息的字段及默认值（上游缺失字段时使用）
+_MUSIC_INFO_DEFAULTS = {
+    "song": "未知歌曲",
+    "singer": "未知歌手",
+    "album": "未知专辑",
+    "cover": "",
+    "url": "",
+    "link": "",
+    "interval": "未知时长",
+    "size": "未知大小",
+    "quality": "未知音质",
+}
+
+# 发送音乐时使用的字段默认值（在标准化字段之外补充 id 与 source）
+_DISPATCH_DEFAULTS = {**_MUSIC_INFO_DEFAULTS, "id": "", "source": "netease"}
+
+# 正在播放消息模板
+_PLAY_TEMPLATE = (
+    "🎵 【正在播放】\n\n"
+    "🎤 歌曲：{song}\n"
+    "🎙️ 歌手：{singer}\n"
+    "💿 专辑：{album}\n"
+    "⏱️ 时长：{interval}\n"
+)
+
+
+async def _dispatch_music(
+    send_text,
+    send_custom,
     music_info: dict,
-    config_getter: callable
-):
+    config_getter: callable,
+    notify_missing_url: bool = True
+) -> str:
     """
-    发送音乐信息到聊天（Command组件使用）
-
-    功能说明：
-    - 发送音乐信息文本（歌名、歌手、专辑、时长）
-    - 发送音乐卡片或语音消息（根据配置）
-    - 发送专辑封面图片（可选）
-    - 自动处理QQ音乐的语音模式
+    发送音乐信息的公共实现（Command 与 Tool 共用）
 
     Args:
-        component: Command组件实例（需要有send_text、send_custom方法）
-        music_info: 音乐信息字典，包含：
-            - song: 歌曲名
-            - singer: 歌手
-            - album: 专辑名
-            - interval: 时长
-            - cover: 封面URL
-            - url: 播放链接
-            - id: 歌曲ID
-            - source: 音乐源（netease/qq/juhe等）
+        send_text: 发送文本的协程函数 send_text(text)
+        send_custom: 发送自定义消息的协程函数 send_custom(message_type, content, display_message=...)
+        music_info: 音乐信息字典
         config_getter: 配置获取函数（如self.get_config）
+        notify_missing_url: 语音模式下缺少播放链接时是否向聊天发送提示
+
+    Returns:
+        歌曲描述（用于调用方记录日志）
     """
+    # 一次性读取配置，避免发送过程中重复查询
+    show_info_text = config_getter("music.show_info_text", True)
+    send_as_voice = config_getter("music.send_as_voice", False)
+    show_cover = config_getter("music.show_cover", True)
+    timeout = config_getter("music.timeout", 10)
+    cover_send_mode = config_getter("music.cover_send_mode", "base64")
+
+    # 与默认值合并一次，之后直接按键取值
+    info = {**_DISPATCH_DEFAULTS, **music_info}
+    song = info["song"]
+    singer = info["singer"]
+    album = info["album"]
+    interval = info["interval"]
+    cover = info["cover"]
+    url = info["url"]
+    song_id = info["id"]
+    music_source = info["source"]
+
+    # 封面下载与文本、卡片发送互不依赖，先在后台开始下载
+    send_cover = bool(cover and show_cover)
+    cover_task = None
+    if send_cover and cover_send_mode != "url":
+        cover_task = asyncio.create_task(_get_cover_base64(cover, timeout))
+
     try:
-        song = music_info.get("song", "未知歌曲")
-        singer = music_info.get("singer", "未知歌手")
-        album = music_info.get("album", "未知专辑")
-        interval = music_info.get("interval", "未知时长")
-        cover = music_info.get("cover", "")
-        url = music_info.get("url", "")
-        song_id = music_info.get("id", "")
-        music_source = music_info.get("source", "netease")
-
-        # 构建消息
-        message = f"🎵 【正在播放】\n\n"
-        message += f"🎤 歌曲：{song}\n"
-        message += f"🎙️ 歌手：{singer}\n"
-        message += f"💿 专辑：{album}\n"
-        message += f"⏱️ 时长：{interval}\n"
-
-        # 发送文本信息
-        if config_getter("music.show_info_text", True):
-            await component.send_text(message)
-
-        # 发送音乐卡片或语音
-        send_as_voice = config_getter("music.send_as_voice", False) or (music_source == "qq")
+        # 发送文本信息（关闭时不构建消息）
+        if show_info_text:
+            await send_text(_PLAY_TEMPLATE.format(song=song, singer=singer, album=album, interval=interval))
+
+        # 发送音乐卡片或语音（QQ音乐强制语音模式）
+        send_as_voice = send_as_voice or (music_source == "qq")
 
         # 构建 display_message，用于存储到聊天记录中供后续查询
         music_display_message = f"[音乐：《{song}》- {singer}]"
 
         if send_as_voice:
             if url:
-                await component.send_custom(message_type="voiceurl", content=url, display_message=music_display_message)
+                await send_custom("voiceurl", url, display_message=music_display_message)
+            elif notify_missing_url:
+                await send_text("❌ 无法获取音乐播放链接")
             else:
-                await component.send_text("❌ 无法获取音乐播放链接")
+                logger.warning("无法获取音乐播放链接")
         else:
             if song_id:
-                await component.send_custom(message_type="music", content=song_id, display_message=music_display_message)
+                await send_custom("music", song_id, display_message=music_display_message)
 
-        # 发送封面
-        if cover and config_getter("music.show_cover", True):
-            timeout = config_getter("music.timeout", 10)
-            client = AsyncAPIClient(timeout)
-            base64_image = await client.download_image_base64(cover)
+        # 发送封面（保持在文本和卡片之后）
+        if cover_task is not None:
+            base64_image = await cover_task
             if base64_image:
-                await component.send_custom(message_type="image", content=base64_image)
+                await send_custom("image", base64_image)
+        elif send_cover:
+            await send_custom("imageurl", cover)
+    finally:
+        # 前面的发送出错时封面不再发送，取消仍在进行的下载
+        if cover_task is not None and not cover_task.done():
+            cover_task.cancel()
 
-        logger.info(f"成功发送音乐《{song}》by {singer}")
-
-    except Exception as e:
-        logger.error(f"发送音乐信息出错: {e}", exc_info=True)
+    return f"《{song}》by {singer}"
 
 
-async def send_music_info_to_stream(
-    stream_id: str,
+async def send_music_info_to_command(
+    component,
     music_info: dict,
     config_getter: callable
 ):
     """
-    发送音乐信息到聊天流（Tool组件使用）
+    发送音乐信息到聊天（Command组件使用）
 
     功能说明：
     - 发送音乐信息文本（歌名、歌手、专辑、时长）
@@ -246,7 +365,7 @@ async def send_music_info_to_stream(
     - 自动处理QQ音乐的语音模式
 
     Args:
-        stream_id: 聊天流ID（用于send_api调用）
+        component: Command组件实例（需要有send_text、send_custom方法）
         music_info: 音乐信息字典，包含：
             - song: 歌曲名
             - singer: 歌手
@@ -258,52 +377,43 @@ async def send_music_info_to_stream(
             - source: 音乐源（netease/qq/juhe等）
         config_getter: 配置获取函数（如self.get_config）
     """
+    async def send_custom(message_type: str, content: str, **kwargs):
+        await component.send_custom(message_type=message_type, content=content, **kwargs)
+
     try:
-        song = music_info.get("song", "未知歌曲")
-        singer = music_info.get("singer", "未知歌手")
-        album = music_info.get("album", "未知专辑")
-        interval = music_info.get("interval", "未知时长")
-        cover = music_info.get("cover", "")
-        url = music_info.get("url", "")
-        song_id = music_info.get("id", "")
-        music_source = music_info.get("source", "netease")
-
-        # 构建消息
-        message = f"🎵 【正在播放】\n\n"
-        message += f"🎤 歌曲：{song}\n"
-        message += f"🎙️ 歌手：{singer}\n"
-        message += f"💿 专辑：{album}\n"
-        message += f"⏱️ 时长：{interval}\n"
-
-        # 发送文本信息
-        if config_getter("music.show_info_text", True):
-            await send_api.text_to_stream(message, stream_id)
-
-        # 发送音乐卡片或语音
-        send_as_voice = config_getter("music.send_as_voice", False) or (music_source == "qq")
+        description = await _dispatch_music(component.send_text, send_custom, music_info, config_getter)
+        logger.info(f"成功发送音乐{description}")
+    except Exception as e:
+        logger.error(f"发送音乐信息出错: {e}", exc_info=True)
 
-        # 构建 display_message，用于存储到聊天记录中供后续查询
-        music_display_message = f"[音乐：《{song}》- {singer}]"
 
-        if send_as_voice:
-            if url:
-                await send_api.custom_to_stream("voiceurl", url, stream_id, display_message=music_display_message)
-            else:
-                logger.warning("无法获取音乐播放链接")
-        else:
-            if song_id:
-                await send_api.custom_to_stream("music", song_id, stream_id, display_message=music_display_message)
+async def send_music_info_to_stream(
+    stream_id: str,
+    music_info: dict,
+    config_getter: callable
+):
+    """
+    发送音乐信息到聊天流（Tool组件使用）
 
-        # 发送封面
-        if cover and config_getter("music.show_cover", True):
-            timeout = config_getter("music.timeout", 10)
-            client = AsyncAPIClient(timeout)
-            base64_image = await client.download_image_base64(cover)
-            if base64_image:
-                await send_api.custom_to_stream("image", base64_image, stream_id)
+    与 send_music_info_to_command 行为一致，区别在于通过 send_api 发送，
+    且语音模式缺少播放链接时只记录日志、不向聊天发送提示
+
+    Args:
+        stream_id: 聊天流ID（用于send_api调用）
+        music_info: 音乐信息字典（字段同 send_music_info_to_command）
+        config_getter: 配置获取函数（如self.get_config）
+    """
+    async def send_text(text: str):
+        await send_api.text_to_stream(text, stream_id)
 
-        logger.info(f"成功发送音乐《{song}》到聊天流 {stream_id}")
+    async def send_custom(message_type: str, content: str, **kwargs):
+        await send_api.custom_to_stream(message_type, content, stream_id, **kwargs)
 
+    try:
+        description = await _dispatch_music(
+            send_text, send_custom, music_info, config_getter, notify_missing_url=False
+        )
+        logger.info(f"成功发送音乐{description}到聊天流 {stream_id}")
     except Exception as e:
         logger.error(f"发送音乐信息到流出错: {e}", exc_info=True)
 
@@ -332,6 +442,19 @@ async def is_quick_choose_valid(chat_id: str, timeout: int = 60) -> bool:
 
 # ===== 音乐源适配器 =====
 
+_API_CONCURRENCY = 8  # 同时进行的上游API请求上限，避免并发搜索触发限流
+_FALLBACK_HEDGE_DELAY = 2.0  # 高优先级音源超过此时间（秒）仍无结果时，提前发起下一个音源的查询
+_api_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_api_semaphore() -> asyncio.Semaphore:
+    """懒加载API并发信号量（在事件循环运行后创建）"""
+    global _api_semaphore
+    if _api_semaphore is None:
+        _api_semaphore = asyncio.Semaphore(_API_CONCURRENCY)
+    return _api_semaphore
+
+
 class MusicSourceAdapter:
     """音乐源适配器基类"""
 
@@ -340,7 +463,12 @@ class MusicSourceAdapter:
         self.timeout = timeout
         self.source_name = "unknown"
         self.source_display_name = "未知"
-        self.client = AsyncAPIClient(timeout)
+        self.client = _get_shared_client(timeout)
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None, log_prefix: str = "[API]") -> Any:
+        """请求上游API（受全局并发上限约束）"""
+        async with _get_api_semaphore():
+            return await self.client.get_json(url, params=params, log_prefix=log_prefix)
 
     async def search_list(self, keyword: str, page: int = 1, num: int = 10) -> Optional[List[dict]]:
         """搜索音乐列表"""
@@ -350,269 +478,182 @@ class MusicSourceAdapter:
         """获取音乐详情"""
         raise NotImplementedError
 
-    def normalize_music_info(self, data: dict) -> dict:
-        """标准化音乐信息格式"""
-        raise NotImplementedError
+    async def fetch_list(self, keyword: str, num: int = 10) -> Optional[List[dict]]:
+        """
+        搜索音乐列表（带缓存）
 
+        关键词忽略大小写和首尾空白，同一音源的相同搜索在缓存有效期内直接复用
 
-class NeteaseAdapter(MusicSourceAdapter):
-    """网易云音乐适配器"""
+        Args:
+            keyword: 搜索关键词
+            num: 返回数量
 
-    def __init__(self, api_url: str, timeout: int):
-        super().__init__(api_url, timeout)
-        self.source_name = "netease"
-        self.source_display_name = "网易云音乐"
+        Returns:
+            音乐列表或None
+        """
+        key = (self.source_name, keyword.strip().lower(), num)
+        music_list = _list_cache.get(key)
+        if music_list is not None:
+            logger.debug("命中搜索结果缓存: %s", key)
+            return music_list
+
+        music_list = await self.search_list(keyword, page=1, num=num)
+        if music_list:
+            _list_cache.set(key, music_list)
+        return music_list
+
+    async def fetch_detail(self, keyword: str, choose: int) -> Optional[dict]:
+        """
+        获取音乐详情（带缓存）
 
-    async def search_list(self, keyword: str, page: int = 1, num: int = 10) -> Optional[List[dict]]:
-        """搜索网易云音乐列表"""
-        try:
-            params = {"word": keyword, "page": page, "num": num}
-            data = await self.client.get_json(
-                f"{self.api_url}/v2/music/netease",
-                params=params,
-                log_prefix="[Netease]"
-            )
-            if data and data.get("code") == 200:
-                result_data = data.get("data", [])
-                if isinstance(result_data, list) and len(result_data) > 0:
-                    return [self.normalize_music_info(item) for item in result_data]
-                elif isinstance(result_data, dict):
-                    return [self.normalize_music_info(result_data)]
-        except Exception as e:
-            logger.error(f"[NeteaseAdapter] 搜索失败: {e}", exc_info=True)
-        return None
+        同一音源、关键词和序号的详情在缓存有效期内直接复用，避免重复请求上游API
 
-    async def get_music_detail(self, keyword: str, choose: int) -> Optional[dict]:
-        """获取网易云音乐详情"""
+        Args:
+            keyword: 搜索关键词
+            choose: 选择第几首歌(从1开始)
+
+        Returns:
+            音乐信息字典或None
+        """
+        key = (self.source_name, keyword, choose)
+        music_info = _detail_cache.get(key)
+        if music_info is not None:
+            logger.debug("命中歌曲详情缓存: %s", key)
+            return music_info
+
+        # 相同请求正在进行（如搜索后的预取）时直接等待其结果
+        entry = _detail_inflight.get(key)
+        if entry is None or entry[0].cancelled():
+            task = asyncio.create_task(self._load_detail(key, keyword, choose))
+            entry = _detail_inflight[key] = [task, 0]
+            task.add_done_callback(partial(_on_detail_done, key))
+        task = entry[0]
+
+        entry[1] += 1
         try:
-            params = {"word": keyword, "choose": choose}
-            data = await self.client.get_json(
-                f"{self.api_url}/v2/music/netease",
-                params=params,
-                log_prefix="[Netease]"
-            )
-            if data and data.get("code") == 200:
-                result_data = data.get("data", {})
-                if isinstance(result_data, list) and len(result_data) > 0:
-                    result_data = result_data[0]
-                if result_data and isinstance(result_data, dict):
-                    return self.normalize_music_info(result_data)
-        except Exception as e:
-            logger.error(f"[NeteaseAdapter] 获取详情失败: {e}", exc_info=True)
-        return None
+            # shield：某个等待者被取消时不影响其他等待同一请求的调用者
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            # 所有等待者都已取消（如多音源并发查询中已有高优先级结果）时一并取消上游请求
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+                # 立即移出进行中列表，之后的相同请求会重新发起，而不是等待这个正在取消的任务
+                if _detail_inflight.get(key) is entry:
+                    del _detail_inflight[key]
+
+    async def _load_detail(self, key: tuple, keyword: str, choose: int) -> Optional[dict]:
+        """请求歌曲详情并写入缓存"""
+        music_info = await self.get_music_detail(keyword, choose)
+        if music_info:
+            _detail_cache.set(key, music_info)
+        return music_info
 
     def normalize_music_info(self, data: dict) -> dict:
-        """标准化网易云音乐信息"""
-        return {
-            "source": self.source_name,
-            "source_name": self.source_display_name,
-            "id": data.get("id", ""),
-            "song": data.get("song", "未知歌曲"),
-            "singer": data.get("singer", "未知歌手"),
-            "album": data.get("album", "未知专辑"),
-            "cover": data.get("cover", ""),
-            "url": data.get("url", ""),
-            "link": data.get("link", ""),
-            "interval": data.get("interval", "未知时长"),
-            "size": data.get("size", "未知大小"),
-            "quality": data.get("quality", "未知音质"),
-        }
+        """标准化音乐信息格式"""
+        raise NotImplementedError
 
 
-class QQMusicAdapter(MusicSourceAdapter):
-    """QQ音乐适配器"""
+# 普通音源（api.vkeys.cn）配置：仅接口路径、名称和日志标签不同，共用同一个适配器实现
+SourceSpec = namedtuple("SourceSpec", "name display endpoint log_tag")
 
-    def __init__(self, api_url: str, timeout: int):
+_VKEYS_SOURCES: Dict[str, SourceSpec] = {
+    "netease": SourceSpec("netease", "网易云音乐", "/v2/music/netease", "Netease"),
+    "qq": SourceSpec("qq", "QQ音乐", "/v2/music/tencent", "QQMusic"),
+}
+
+
+class VkeysAdapter(MusicSourceAdapter):
+    """普通音源适配器（网易云音乐 / QQ音乐），由 SourceSpec 决定具体音源"""
+
+    def __init__(self, spec: SourceSpec, api_url: str, timeout: int):
         super().__init__(api_url, timeout)
-        self.source_name = "qq"
-        self.source_display_name = "QQ音乐"
+        self.spec = spec
+        self.source_name = spec.name
+        self.source_display_name = spec.display
+        self.endpoint = f"{api_url}{spec.endpoint}"
 
     async def search_list(self, keyword: str, page: int = 1, num: int = 10) -> Optional[List[dict]]:
-        """搜索QQ音乐列表"""
+        """搜索音乐列表"""
         try:
             params = {"word": keyword, "page": page, "num": num}
-            data = await self.client.get_json(
-                f"{self.api_url}/v2/music/tencent",
+            data = await self._get_json(
+                self.endpoint,
                 params=params,
-                log_prefix="[QQMusic]"
+                log_prefix=f"[{self.spec.log_tag}]"
             )
             if data and data.get("code") == 200:
                 result_data = data.get("data", [])
-                if isinstance(result_data, list) and len(result_data) > 0:
+                if isinstance(result_data, list) and result_data:
                     return [self.normalize_music_info(item) for item in result_data]
                 elif isinstance(result_data, dict):
                     return [self.normalize_music_info(result_data)]
         except Exception as e:
-            logger.error(f"[QQMusicAdapter] 搜索失败: {e}", exc_info=True)
+            logger.error(f"[{self.spec.log_tag}Adapter] 搜索失败: {e}", exc_info=True)
         return None
 
     async def get_music_detail(self, keyword: str, choose: int) -> Optional[dict]:
-        """获取QQ音乐详情"""
+        """获取音乐详情"""
         try:
             params = {"word": keyword, "choose": choose}
-            data = await self.client.get_json(
-                f"{self.api_url}/v2/music/tencent",
+            data = await self._get_json(
+                self.endpoint,
                 params=params,
-                log_prefix="[QQMusic]"
+                log_prefix=f"[{self.spec.log_tag}]"
             )
             if data and data.get("code") == 200:
                 result_data = data.get("data", {})
-                if isinstance(result_data, list) and len(result_data) > 0:
+                if isinstance(result_data, list) and result_data:
                     result_data = result_data[0]
                 if result_data and isinstance(result_data, dict):
                     return self.normalize_music_info(result_data)
         except Exception as e:
-            logger.error(f"[QQMusicAdapter] 获取详情失败: {e}", exc_info=True)
+            logger.error(f"[{self.spec.log_tag}Adapter] 获取详情失败: {e}", exc_info=True)
         return None
 
     def normalize_music_info(self, data: dict) -> dict:
-        """标准化QQ音乐信息"""
-        return {
+        """标准化音乐信息（QQ音乐可能只返回mid，作为id的后备）"""
+        info = {
             "source": self.source_name,
             "source_name": self.source_display_name,
             "id": data.get("id", "") or data.get("mid", ""),
-            "song": data.get("song", "未知歌曲"),
-            "singer": data.get("singer", "未知歌手"),
-            "album": data.get("album", "未知专辑"),
-            "cover": data.get("cover", ""),
-            "url": data.get("url", ""),
-            "link": data.get("link", ""),
-            "interval": data.get("interval", "未知时长"),
-            "size": data.get("size", "未知大小"),
-            "quality": data.get("quality", "未知音质"),
         }
+        info.update(_MUSIC_INFO_DEFAULTS)
+        info.update({key: data[key] for key in _MUSIC_INFO_DEFAULTS.keys() & data.keys()})
+        return info
 
 
-class NeteaseVIPAdapter(MusicSourceAdapter):
-    """网易云音乐VIP适配器"""
+# VIP音源（littleyouzi）配置：仅接口路径、音质参数名、名称和日志标签不同，共用同一个适配器实现
+VipSourceSpec = namedtuple("VipSourceSpec", "name display path quality_param log_tag")
 
-    def __init__(self, vip_api_url: str, timeout: int):
-        # 拼接完整的API路径
-        full_api_url = vip_api_url.rstrip('/') + '/netmusic'
-        super().__init__(full_api_url, timeout)
-        self.source_name = "netease_vip"
-        self.source_display_name = "网易云音乐VIP"
+_VIP_SOURCES: Dict[str, VipSourceSpec] = {
+    "netease_vip": VipSourceSpec("netease_vip", "网易云音乐VIP", "/netmusic", "level", "NeteaseVIP"),
+    "qq_vip": VipSourceSpec("qq_vip", "QQ音乐VIP", "/qqmusic", "quality", "QQMusicVIP"),
+}
 
-    async def search_list(self, keyword: str, page: int = 1, num: int = 10) -> Optional[List[dict]]:
-        """搜索网易云音乐VIP列表"""
-        try:
-            # 限制返回数量在1-100之间
-            limit = min(max(num, 1), 100)
-            params = {"name": keyword, "limit": limit}
 
-            data = await self.client.get_json(
-                self.api_url,
-                params=params,
-                log_prefix="[NeteaseVIP]"
-            )
+class VipAdapter(MusicSourceAdapter):
+    """VIP音源适配器（网易云音乐VIP / QQ音乐VIP），由 VipSourceSpec 决定具体音源"""
 
-            # 根据API文档,返回格式可能是列表或对象
-            if data:
-                # 如果返回是列表,直接使用
-                if isinstance(data, list):
-                    return [self.normalize_music_info(item) for item in data[:limit]]
-                # 如果返回是字典,可能包含data字段
-                elif isinstance(data, dict):
-                    result_data = data.get("data", data)
-                    if isinstance(result_data, list):
-                        return [self.normalize_music_info(item) for item in result_data[:limit]]
-                    else:
-                        return [self.normalize_music_info(result_data)]
-        except Exception as e:
-            logger.error(f"[NeteaseVIPAdapter] 搜索失败: {e}", exc_info=True)
-        return None
-
-    async def get_music_detail(self, keyword: str, choose: int) -> Optional[dict]:
-        """获取网易云音乐VIP详情
-
-        Args:
-            keyword: 搜索关键词
-            choose: 选择第几首歌(从1开始)
-        """
-        try:
-            # 先搜索歌曲列表
-            music_list = await self.search_list(keyword, page=1, num=choose)
-
-            if not music_list or len(music_list) < choose:
-                logger.warning(f"[NeteaseVIPAdapter] 搜索结果不足,需要第{choose}首,实际只有{len(music_list) if music_list else 0}首")
-                return None
-
-            # 从列表中获取指定序号的歌曲
-            selected_music = music_list[choose - 1]  # choose从1开始,列表从0开始
-
-            # 如果有mid,使用mid获取高音质链接
-            mid = selected_music.get("mid") or selected_music.get("id")
-            if mid:
-                # 使用mid获取VIP音质的播放链接
-                params = {"mid": mid, "level": 2}  # level=2是建议的最低音质
-
-                data = await self.client.get_json(
-                    self.api_url,
-                    params=params,
-                    log_prefix="[NeteaseVIP]"
-                )
-
-                if data:
-                    # VIP API返回格式: {"data": {...}, "retcode": 0}
-                    if isinstance(data, dict):
-                        # 提取data字段
-                        vip_data = data.get("data", data)
-                        url = vip_data.get("url") or vip_data.get("mp3")
-                        if url:
-                            selected_music["url"] = url
-                            selected_music["quality"] = "VIP音质"
-                            # 更新其他信息
-                            if vip_data.get("size"):
-                                selected_music["size"] = vip_data.get("size")
-                            if vip_data.get("level"):
-                                selected_music["quality"] = f"VIP音质({vip_data.get('level')})"
-
-            return selected_music
-
-        except Exception as e:
-            logger.error(f"[NeteaseVIPAdapter] 获取详情失败: {e}", exc_info=True)
-        return None
-
-    def normalize_music_info(self, data: dict) -> dict:
-        """标准化网易云音乐VIP信息"""
-        return {
-            "source": self.source_name,
-            "source_name": self.source_display_name,
-            "id": data.get("id", "") or data.get("mid", ""),
-            "mid": data.get("mid", ""),
-            "song": data.get("song", "") or data.get("name", "未知歌曲"),
-            "singer": data.get("singer", "") or data.get("artist", "未知歌手"),
-            "album": data.get("album", "未知专辑"),
-            "cover": data.get("cover", "") or data.get("pic", ""),
-            "url": data.get("url", "") or data.get("mp3", ""),
-            "link": data.get("link", ""),
-            "interval": data.get("interval", "") or data.get("time", "未知时长"),
-            "size": data.get("size", "未知大小"),
-            "quality": data.get("quality", "") or data.get("level", "VIP音质"),
-        }
-
-
-class QQMusicVIPAdapter(MusicSourceAdapter):
-    """QQ音乐VIP适配器"""
-
-    def __init__(self, vip_api_url: str, timeout: int):
+    def __init__(self, spec: VipSourceSpec, vip_api_url: str, timeout: int):
         # 拼接完整的API路径
-        full_api_url = vip_api_url.rstrip('/') + '/qqmusic'
+        full_api_url = vip_api_url.rstrip('/') + spec.path
         super().__init__(full_api_url, timeout)
-        self.source_name = "qq_vip"
-        self.source_display_name = "QQ音乐VIP"
+        self.spec = spec
+        self.source_name = spec.name
+        self.source_display_name = spec.display
 
     async def search_list(self, keyword: str, page: int = 1, num: int = 10) -> Optional[List[dict]]:
-        """搜索QQ音乐VIP列表"""
+        """搜索VIP音乐列表"""
         try:
             # 限制返回数量在1-100之间
             limit = min(max(num, 1), 100)
             params = {"name": keyword, "limit": limit}
 
-            data = await self.client.get_json(
+            data = await self._get_json(
                 self.api_url,
                 params=params,
-                log_prefix="[QQMusicVIP]"
+                log_prefix=f"[{self.spec.log_tag}]"
             )
 
             # 根据API文档,返回格式可能是列表或对象
@@ -628,11 +669,11 @@ class QQMusicVIPAdapter(MusicSourceAdapter):
                     else:
                         return [self.normalize_music_info(result_data)]
         except Exception as e:
-            logger.error(f"[QQMusicVIPAdapter] 搜索失败: {e}", exc_info=True)
+            logger.error(f"[{self.spec.log_tag}Adapter] 搜索失败: {e}", exc_info=True)
         return None
 
     async def get_music_detail(self, keyword: str, choose: int) -> Optional[dict]:
-        """获取QQ音乐VIP详情
+        """获取VIP音乐详情
 
         Args:
             keyword: 搜索关键词
@@ -643,7 +684,7 @@ class QQMusicVIPAdapter(MusicSourceAdapter):
             music_list = await self.search_list(keyword, page=1, num=choose)
 
             if not music_list or len(music_list) < choose:
-                logger.warning(f"[QQMusicVIPAdapter] 搜索结果不足,需要第{choose}首,实际只有{len(music_list) if music_list else 0}首")
+                logger.warning(f"[{self.spec.log_tag}Adapter] 搜索结果不足,需要第{choose}首,实际只有{len(music_list) if music_list else 0}首")
                 return None
 
             # 从列表中获取指定序号的歌曲
@@ -652,13 +693,13 @@ class QQMusicVIPAdapter(MusicSourceAdapter):
             # 如果有mid,使用mid获取高音质链接
             mid = selected_music.get("mid") or selected_music.get("id")
             if mid:
-                # 使用mid获取VIP音质的播放链接
-                params = {"mid": mid, "quality": 2}  # quality=2
+                # 使用mid获取VIP音质的播放链接（2是建议的最低音质）
+                params = {"mid": mid, self.spec.quality_param: 2}
 
-                data = await self.client.get_json(
+                data = await self._get_json(
                     self.api_url,
                     params=params,
-                    log_prefix="[QQMusicVIP]"
+                    log_prefix=f"[{self.spec.log_tag}]"
                 )
 
                 if data:
@@ -679,11 +720,11 @@ class QQMusicVIPAdapter(MusicSourceAdapter):
             return selected_music
 
         except Exception as e:
-            logger.error(f"[QQMusicVIPAdapter] 获取详情失败: {e}", exc_info=True)
+            logger.error(f"[{self.spec.log_tag}Adapter] 获取详情失败: {e}", exc_info=True)
         return None
 
     def normalize_music_info(self, data: dict) -> dict:
-        """标准化QQ音乐VIP信息"""
+        """标准化VIP音乐信息"""
         return {
             "source": self.source_name,
             "source_name": self.source_display_name,
@@ -714,7 +755,7 @@ class JuheAdapter(MusicSourceAdapter):
         try:
             # 不使用n参数,API会返回多首歌曲列表
             params = {"msg": keyword, "type": "json"}
-            data = await self.client.get_json(
+            data = await self._get_json(
                 self.api_url,
                 params=params,
                 log_prefix="[Juhe]"
@@ -724,13 +765,13 @@ class JuheAdapter(MusicSourceAdapter):
             if data and isinstance(data, dict):
                 result_list = data.get("list")
 
-                if isinstance(result_list, list) and len(result_list) > 0:
+                if isinstance(result_list, list) and result_list:
                     # 限制返回数量
                     music_list = [self.normalize_music_info(item, i) for i, item in enumerate(result_list[:num])]
                     return music_list
 
             # 如果data直接是列表
-            elif isinstance(data, list) and len(data) > 0:
+            elif isinstance(data, list) and data:
                 music_list = [self.normalize_music_info(item, i) for i, item in enumerate(data[:num])]
                 return music_list
 
@@ -749,7 +790,7 @@ class JuheAdapter(MusicSourceAdapter):
         """
         try:
             params = {"msg": keyword, "n": choose, "type": "json"}
-            response = await self.client.get_json(
+            response = await self._get_json(
                 self.api_url,
                 params=params,
                 log_prefix="[Juhe]"
@@ -811,8 +852,9 @@ class JuheAdapter(MusicSourceAdapter):
         }
 
 
+@lru_cache(maxsize=16)
 def get_music_adapter(source: str, api_url: str, timeout: int, vip_api_url: str = None, juhe_api_url: str = None) -> MusicSourceAdapter:
-    """获取音乐源适配器
+    """获取音乐源适配器（按参数缓存实例，适配器本身无状态，可安全复用）
 
     Args:
         source: 音乐源(netease/qq/netease_vip/qq_vip/juhe)
@@ -821,21 +863,172 @@ def get_music_adapter(source: str, api_url: str, timeout: int, vip_api_url: str
         vip_api_url: VIP API地址
         juhe_api_url: 聚合点歌API地址
     """
-    if source == "qq":
-        return QQMusicAdapter(api_url, timeout)
-    elif source == "qq_vip":
-        return QQMusicVIPAdapter(vip_api_url or "https://www.littleyouzi.com/api/v2/qqmusic", timeout)
-    elif source == "netease_vip":
-        return NeteaseVIPAdapter(vip_api_url or "https://www.littleyouzi.com/api/v2/netmusic", timeout)
+    if source in _VIP_SOURCES:
+        return VipAdapter(_VIP_SOURCES[source], vip_api_url or "https://www.littleyouzi.com/api/v2", timeout)
     elif source == "juhe":
         return JuheAdapter(juhe_api_url or "https://api.xcvts.cn/api/music/juhe", timeout)
     else:
-        return NeteaseAdapter(api_url, timeout)
+        return VkeysAdapter(_VKEYS_SOURCES.get(source, _VKEYS_SOURCES["netease"]), api_url, timeout)
+
+
+# ===== 默认禁用命令的 CommandInfo =====
+
+_disabled_command_infos: Dict[type, CommandInfo] = {}
+
+
+def get_disabled_command_info(command_cls) -> CommandInfo:
+    """
+    获取默认禁用的CommandInfo（按类缓存，只构造一次）
+
+    ChooseCommand/QuickChooseCommand 默认禁用，在有搜索缓存时动态启用
+
+    Args:
+        command_cls: Command类
+
+    Returns:
+        CommandInfo实例
+    """
+    info = _disabled_command_infos.get(command_cls)
+    if info is None:
+        info = CommandInfo(
+            name=command_cls.command_name,
+            component_type=ComponentType.COMMAND,
+            description=command_cls.command_description,
+            command_pattern=command_cls.command_pattern,
+            enabled=False  # 默认禁用，在有搜索缓存时动态启用
+        )
+        _disabled_command_infos[command_cls] = info
+    return info
+
+
+# ===== 多音源并发搜索 =====
+
+_ALL_SOURCES = ("netease", "qq", "netease_vip", "qq_vip", "juhe")
+
+
+def resolve_sources(user_source: str, default_source: str) -> List[str]:
+    """
+    确定搜索源及优先级
+
+    Args:
+        user_source: 用户指定的音源（为空则使用全部音源）
+        default_source: 默认音源（排在最前）
+
+    Returns:
+        按优先级排列的音源列表
+    """
+    if user_source:
+        return [user_source]
+    all_sources = list(_ALL_SOURCES)
+    if default_source in all_sources:
+        all_sources.remove(default_source)
+        all_sources.insert(0, default_source)
+    return all_sources
+
+
+async def _query_source(source: str, query, log_prefix: str):
+    """
+    对单个音源执行查询
+
+    超时、连接错误等瞬时错误已由 AsyncAPIClient.get_json 按指数退避重试，这里不再重试；
+    返回空结果视为"未找到"
+    """
+    try:
+        return await query(source) or None
+    except Exception as e:
+        logger.error(f"{log_prefix}音乐源 {source} 查询出错: {e}", exc_info=True)
+        return None
+
+
+async def query_sources_concurrently(sources: List[str], query, log_prefix: str = "") -> Tuple[Optional[str], Any]:
+    """
+    对冲查询多个音源，按优先级返回第一个非空结果
+
+    先只查询最高优先级的音源；已发起的音源全部失败，或等待超过 _FALLBACK_HEDGE_DELAY 秒仍无结果时，
+    再发起下一个音源。高优先级音源有结果时立即返回并取消其余请求，
+    正常情况下每次查询只占用一个上游请求名额，不会挤占其他用户的并发配额
+
+    Args:
+        sources: 按优先级排列的音源列表
+        query: 查询协程函数，接收音源名，返回查询结果（空结果视为失败）
+        log_prefix: 日志前缀
+
+    Returns:
+        (成功的音源, 查询结果)，全部失败返回 (None, None)
+    """
+    loop = asyncio.get_running_loop()
+    tasks: List[asyncio.Task] = []
+    checked = 0  # 按优先级已确认失败的音源数
+    next_start = 0.0  # 下一个音源的对冲发起时间（loop.time()）
+    try:
+        while True:
+            # 按优先级检查已完成的查询，高优先级音源未完成时不采用低优先级的结果
+            while checked < len(tasks) and tasks[checked].done():
+                result = tasks[checked].result()
+                if result:
+                    return sources[checked], result
+                checked += 1
+            if checked == len(sources):
+                return None, None
+
+            # 已发起的音源全部失败，或到达对冲时间：发起下一个音源
+            if len(tasks) < len(sources) and (checked == len(tasks) or loop.time() >= next_start):
+                source = sources[len(tasks)]
+                tasks.append(asyncio.create_task(_query_source(source, query, log_prefix)))
+                next_start = loop.time() + _FALLBACK_HEDGE_DELAY
+                continue
+
+            timeout = max(next_start - loop.time(), 0) if len(tasks) < len(sources) else None
+            await asyncio.wait(tasks[checked:], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+# ===== 配置缓存 =====
+
+class _MusicConfigMixin:
+    """音乐组件配置缓存：每个组件实例只读取一次 music.* 配置"""
+
+    @cached_property
+    def _cfg(self) -> Dict[str, Any]:
+        """
+        本实例使用的音乐配置
+
+        组件每条消息都会重新实例化，按实例缓存即可在同一次执行内复用，
+        配置修改后的下一条消息也能立即读到新值
+        """
+        get = self.get_config
+        return {
+            "api_url": get("music.api_url", "https://api.vkeys.cn"),
+            "vip_api_url": get("music.vip_api_url", "https://www.littleyouzi.com/api/v2"),
+            "juhe_api_url": get("music.juhe_api_url", "https://api.xcvts.cn/api/music/juhe"),
+            "timeout": get("music.timeout", 10),
+            "max_results": get("music.max_search_results", 10),
+            "default_source": get("music.default_source", "netease"),
+            "enable_quick_choose": get("music.enable_quick_choose", True),
+            "quick_choose_timeout": get("music.quick_choose_timeout", 60),
+            "prefetch_first_detail": get("music.prefetch_first_detail", False),
+        }
+
+    def _get_adapter(self, source: str) -> MusicSourceAdapter:
+        """按当前配置获取音乐源适配器"""
+        cfg = self._cfg
+        return get_music_adapter(source, cfg["api_url"], cfg["timeout"], cfg["vip_api_url"], cfg["juhe_api_url"])
+
+
+class _MusicSendMixin:
+    """选择类命令共用的音乐发送逻辑"""
+
+    async def _send_music_info(self, music_info: dict):
+        """发送音乐信息（调用公共函数）"""
+        await send_music_info_to_command(self, music_info, self.get_config)
 
 
 # ===== Command 组件 =====
 
-class MusicCommand(BaseCommand):
+class MusicCommand(_MusicConfigMixin, BaseCommand):
     """音乐点歌 Command - 搜索音乐列表"""
 
     command_name = "music"
@@ -870,57 +1063,29 @@ class MusicCommand(BaseCommand):
                 )
                 return False, "缺少歌曲名称", True
 
-            # 获取配置
-            api_url = self.get_config("music.api_url", "https://api.vkeys.cn")
-            vip_api_url = self.get_config("music.vip_api_url", "https://www.littleyouzi.com/api/v2")
-            juhe_api_url = self.get_config("music.juhe_api_url", "https://api.xcvts.cn/api/music/juhe")
-            timeout = self.get_config("music.timeout", 10)
-            max_results = self.get_config("music.max_search_results", 10)
-            default_source = self.get_config("music.default_source", "netease")
-
-            # 确定搜索源
-            if user_source:
-                all_sources = [user_source]
-            else:
-                all_sources = ["netease", "qq", "netease_vip", "qq_vip", "juhe"]
-                if default_source in all_sources:
-                    all_sources.remove(default_source)
-                    all_sources.insert(0, default_source)
-
-            # 尝试各个音源
-            music_list = None
-            successful_source = None
-            adapter = None
-
-            for source in all_sources:
-                for attempt in range(1, 4):  # 每个源尝试3次
-                    try:
-                        # 根据源类型选择合适的API URL
-                        if source in ["netease_vip", "qq_vip"]:
-                            adapter = get_music_adapter(source, api_url, timeout, vip_api_url, juhe_api_url)
-                        elif source == "juhe":
-                            adapter = get_music_adapter(source, api_url, timeout, vip_api_url, juhe_api_url)
-                        else:
-                            adapter = get_music_adapter(source, api_url, timeout, vip_api_url, juhe_api_url)
-
-                        music_list = await adapter.search_list(song_name, page=1, num=max_results)
-
-                        if music_list and len(music_list) > 0:
-                            successful_source = source
-                            logger.info(f"在 {source} 找到 {len(music_list)} 首歌曲")
-                            break
-                    except Exception as e:
-                        logger.error(f"音乐源 {source} 第 {attempt} 次尝试出错: {e}", exc_info=True)
-                        if attempt < 3:
-                            await asyncio.sleep(0.5)
-
-                if music_list and len(music_list) > 0:
-                    break
-
-            if not music_list or len(music_list) == 0:
+            max_results = self._cfg["max_results"]
+
+            # 并发搜索各个音源，按优先级取第一个有结果的
+            async def search(source: str):
+                return await self._get_adapter(source).fetch_list(song_name, num=max_results)
+
+            successful_source, music_list = await query_sources_concurrently(
+                resolve_sources(user_source, self._cfg["default_source"]), search
+            )
+
+            if not music_list:
                 await self.send_text("❌ 未找到相关音乐，请尝试其他关键词")
                 return False, "未找到音乐", True
 
+            adapter = self._get_adapter(successful_source)
+            source_display_name = adapter.source_display_name
+            logger.info(f"在 {successful_source} 找到 {len(music_list)} 首歌曲")
+
+            # 大多数用户会选第一首：开启预取时在后台获取其详情，与列表渲染、发送重叠，选歌时直接命中缓存
+            # （每次搜索会多一次上游请求，默认关闭）
+            if self._cfg["prefetch_first_detail"]:
+                _run_in_background(adapter.fetch_detail(song_name, 1))
+
             # 保存搜索结果到缓存
             # 群聊：整个群共享搜索结果；私聊：每个用户独立缓存
             is_private = self.message.message_info.group_info is None or self.message.message_info.group_info.group_id is None
@@ -931,13 +1096,19 @@ class MusicCommand(BaseCommand):
                 group_id = self.message.message_info.group_info.group_id
                 search_key = f"music_search_group_{group_id}"
 
-            await set_search_cache(search_key, song_name, music_list, source=successful_source)
+            # 缓存写入与列表图片渲染互不依赖，并发执行
+            cache_task = asyncio.create_task(
+                set_search_cache(search_key, song_name, music_list, source=successful_source)
+            )
+
+            # 生成列表图片（CPU密集，在线程中执行，不阻塞事件循环）
+            img_base64 = await generate_music_list_image_async(music_list, song_name, source_display_name)
+
+            # 发送列表前确保缓存已写入，保证用户看到列表后即可选歌
+            await cache_task
             logger.info(f"已保存 {len(music_list)} 个搜索结果到缓存 ({'私聊' if is_private else '群聊'}): {search_key}")
 
             # 发送列表（图片或文本）
-            source_display_name = adapter.source_display_name if adapter else ""
-            img_base64 = generate_music_list_image(music_list, song_name, source_display_name)
-
             if img_base64:
                 await self.send_custom(message_type="image", content=img_base64)
             else:
@@ -952,7 +1123,7 @@ class MusicCommand(BaseCommand):
             return False, f"搜索失败: {e}", True
 
 
-class ChooseCommand(BaseCommand):
+class ChooseCommand(_MusicConfigMixin, _MusicSendMixin, BaseCommand):
     """选择歌曲 Command"""
 
     command_name = "choose"
@@ -965,12 +1136,8 @@ class ChooseCommand(BaseCommand):
     async def execute(self) -> Tuple[bool, str, bool]:
         """执行选择歌曲命令"""
         try:
-            index_str = ((self.matched_groups or {}).get("index") or "").strip()
-            if not index_str:
-                await self.send_text("❌ 请输入正确的格式：/choose 序号")
-                return False, "缺少序号", True
-
-            index = int(index_str)
+            # index 由 \d+ 匹配，必定存在且为数字
+            index = int(self.matched_groups["index"])
 
             # 获取缓存（群聊共享，私聊独立）
             is_private = self.message.message_info.group_info is None or self.message.message_info.group_info.group_id is None
@@ -992,17 +1159,13 @@ class ChooseCommand(BaseCommand):
                 return False, "序号超出范围", True
 
             # 获取完整音乐信息
-            api_url = self.get_config("music.api_url", "https://api.vkeys.cn")
-            vip_api_url = self.get_config("music.vip_api_url", "https://www.littleyouzi.com/api/v2")
-            juhe_api_url = self.get_config("music.juhe_api_url", "https://api.xcvts.cn/api/music/juhe")
-            timeout = self.get_config("music.timeout", 10)
             keyword = search_data.get("keyword", "")
             source = search_data.get("source", "netease")
 
             # 根据源类型选择合适的适配器
-            adapter = get_music_adapter(source, api_url, timeout, vip_api_url, juhe_api_url)
+            adapter = self._get_adapter(source)
 
-            music_info = await adapter.get_music_detail(keyword, index)
+            music_info = await adapter.fetch_detail(keyword, index)
 
             if music_info:
                 await self._send_music_info(music_info)
@@ -1011,38 +1174,23 @@ class ChooseCommand(BaseCommand):
                 await self.send_text("❌ 获取歌曲详情失败，请重新搜索")
                 return False, "获取歌曲详情失败", True
 
-        except ValueError:
-            await self.send_text("❌ 请输入有效的数字")
-            return False, "序号格式错误", True
         except Exception as e:
             logger.error(f"选择命令执行出错: {e}", exc_info=True)
             await self.send_text(f"❌ 选择失败: {str(e)}")
             return False, f"选择失败: {e}", True
 
-    async def _send_music_info(self, music_info: dict):
-        """发送音乐信息（调用公共函数）"""
-        await send_music_info_to_command(self, music_info, self.get_config)
-
     @classmethod
     def get_command_info(cls):
         """重写父类方法，返回默认禁用的CommandInfo（动态注册）"""
-        from src.plugin_system.base.component_types import CommandInfo, ComponentType
+        return get_disabled_command_info(cls)
 
-        return CommandInfo(
-            name=cls.command_name,
-            component_type=ComponentType.COMMAND,
-            description=cls.command_description,
-            command_pattern=cls.command_pattern,
-            enabled=False  # 默认禁用，在有搜索缓存时动态启用
-        )
 
-
-class QuickChooseCommand(BaseCommand):
+class QuickChooseCommand(_MusicConfigMixin, _MusicSendMixin, BaseCommand):
     """数字快捷选择 Command"""
 
     command_name = "quick_choose"
     command_description = "快捷选择歌曲（直接输入数字）"
-    command_pattern = r"^(?P<index>\d+)$"
+    command_pattern = r"^(?P<index>[1-9]|10)$"  # 只匹配 1-10，其余纯数字消息在正则层直接放行
     command_help = "快捷选择歌曲，用法：直接输入数字 1-10"
     command_examples = ["1", "5", "10"]
     intercept_message = True
@@ -1054,9 +1202,8 @@ class QuickChooseCommand(BaseCommand):
         其他时候直接不响应，让数字消息正常传递给其他功能
         """
         try:
-            # 1. 检查是否启用快捷选择
-            if not self.get_config("music.enable_quick_choose", True):
-                return False, "", False
+            # 1. 解析数字（正则已限定为 1-10，int 不会失败，超出范围的数字消息也不会进入这里）
+            index = int(self.matched_groups["index"])
 
             # 2. 获取缓存 key（群聊共享，私聊独立）
             is_private = self.message.message_info.group_info is None or self.message.message_info.group_info.group_id is None
@@ -1067,13 +1214,20 @@ class QuickChooseCommand(BaseCommand):
                 group_id = self.message.message_info.group_info.group_id
                 search_key = f"music_search_group_{group_id}"
 
-            # 3. 检查是否有搜索缓存（最重要：没有搜索就不监听数字）
+            # 3. 没有搜索记录就不监听数字（一次字典查找即放行，无需加锁和读取配置）
+            if search_key not in _search_cache:
+                return False, "", False
+
+            # 4. 检查是否启用快捷选择，并获取缓存（带过期检查）
+            if not self._cfg["enable_quick_choose"]:
+                return False, "", False
+
             search_data = await get_search_cache(search_key)
             if not search_data:
                 return False, "", False
 
-            # 4. 检查缓存是否在有效期内（默认60秒）
-            quick_choose_timeout = self.get_config("music.quick_choose_timeout", 60)
+            # 5. 检查缓存是否在有效期内（默认60秒）
+            quick_choose_timeout = self._cfg["quick_choose_timeout"]
             cache_timestamp = search_data.get("timestamp", 0)
             time_elapsed = time.time() - cache_timestamp
 
@@ -1081,32 +1235,20 @@ class QuickChooseCommand(BaseCommand):
             if time_elapsed > quick_choose_timeout:
                 return False, "", False
 
-            # 5. 到这里说明有有效的搜索记录，开始解析数字
-            index_str = ((self.matched_groups or {}).get("index") or "").strip()
-            if not index_str:
-                return False, "", False
-
-            index = int(index_str)
-            if index < 1 or index > 10:
-                return False, "", False
-
+            # 6. 到这里说明有有效的搜索记录，检查序号是否超出结果数
             music_list = search_data.get("results", [])
             if index > len(music_list):
                 await self.send_text(f"❌ 序号超出范围，当前列表只有 {len(music_list)} 首歌曲")
                 return False, "序号超出范围", True
 
             # 获取音乐信息并播放（复用 ChooseCommand 逻辑）
-            api_url = self.get_config("music.api_url", "https://api.vkeys.cn")
-            vip_api_url = self.get_config("music.vip_api_url", "https://www.littleyouzi.com/api/v2")
-            juhe_api_url = self.get_config("music.juhe_api_url", "https://api.xcvts.cn/api/music/juhe")
-            timeout = self.get_config("music.timeout", 10)
             keyword = search_data.get("keyword", "")
             source = search_data.get("source", "netease")
 
             # 根据源类型选择合适的适配器
-            adapter = get_music_adapter(source, api_url, timeout, vip_api_url, juhe_api_url)
+            adapter = self._get_adapter(source)
 
-            music_info = await adapter.get_music_detail(keyword, index)
+            music_info = await adapter.fetch_detail(keyword, index)
 
             if music_info:
                 # 直接发送音乐信息
@@ -1116,32 +1258,18 @@ class QuickChooseCommand(BaseCommand):
                 await self.send_text("❌ 获取歌曲详情失败")
                 return False, "获取歌曲详情失败", True
 
-        except ValueError:
-            return False, "数字格式错误", False
         except Exception as e:
             logger.error(f"快捷选择出错: {e}", exc_info=True)
             return False, f"快捷选择失败: {e}", False
 
-    async def _send_music_info(self, music_info: dict):
-        """发送音乐信息（调用公共函数）"""
-        await send_music_info_to_command(self, music_info, self.get_config)
-
     @classmethod
     def get_command_info(cls):
         """重写父类方法，返回默认禁用的CommandInfo（动态注册）"""
-        from src.plugin_system.base.component_types import CommandInfo, ComponentType
-
-        return CommandInfo(
-            name=cls.command_name,
-            component_type=ComponentType.COMMAND,
-            description=cls.command_description,
-            command_pattern=cls.command_pattern,
-            enabled=False  # 默认禁用，在有搜索缓存时动态启用
-        )
+        return get_disabled_command_info(cls)
 
 # ===== Tool 组件 =====
 
-class PlayMusicTool(BaseTool):
+class PlayMusicTool(_MusicConfigMixin, BaseTool):
     """播放音乐 Tool - 供AI主动调用"""
 
     name = "play_music"
@@ -1160,56 +1288,19 @@ class PlayMusicTool(BaseTool):
 
             # 如果歌名为空，使用默认热门歌曲列表随机选一首
             if not song_name:
-                import random
-                default_songs = [
-                    "水星记", "起风了", "光年之外", "稻香", "晴天",
-                    "告白气球", "青花瓷", "七里香", "遇见", "演员"
-                ]
-                song_name = random.choice(default_songs)
+                song_name = random.choice(_DEFAULT_SONGS)
                 logger.info(f"[PlayMusicTool] 用户未指定歌名，自动推荐: {song_name}")
 
-            # 获取配置
-            api_url = self.get_config("music.api_url", "https://api.vkeys.cn")
-            vip_api_url = self.get_config("music.vip_api_url", "https://www.littleyouzi.com/api/v2")
-            juhe_api_url = self.get_config("music.juhe_api_url", "https://api.xcvts.cn/api/music/juhe")
-            timeout = self.get_config("music.timeout", 10)
-            default_source = self.get_config("music.default_source", "netease")
+            # 并发搜索各个音源，按优先级取第一个有结果的
+            # 详情接口本身就按关键词搜索并取第 choose 首，无结果时返回 None，无需先单独搜索列表
+            async def fetch_first(source: str):
+                return await self._get_adapter(source).fetch_detail(song_name, 1)
 
-            # 确定搜索源
-            if user_source:
-                all_sources = [user_source]
-            else:
-                all_sources = ["netease", "qq", "netease_vip", "qq_vip", "juhe"]
-                if default_source in all_sources:
-                    all_sources.remove(default_source)
-                    all_sources.insert(0, default_source)
-
-            # 尝试各个音源搜索
-            music_info = None
-            successful_source = None
-
-            for source in all_sources:
-                for attempt in range(1, 4):  # 每个源尝试3次
-                    try:
-                        # 根据源类型选择合适的适配器
-                        adapter = get_music_adapter(source, api_url, timeout, vip_api_url, juhe_api_url)
-
-                        music_list = await adapter.search_list(song_name, page=1, num=1)
-
-                        if music_list and len(music_list) > 0:
-                            # 获取第一首歌的详细信息
-                            music_info = await adapter.get_music_detail(song_name, 1)
-                            if music_info:
-                                successful_source = source
-                                logger.info(f"[PlayMusicTool] 在 {source} 找到歌曲: {music_info.get('song')}")
-                                break
-                    except Exception as e:
-                        logger.error(f"[PlayMusicTool] 音乐源 {source} 第 {attempt} 次尝试出错: {e}", exc_info=True)
-                        if attempt < 3:
-                            await asyncio.sleep(0.5)
-
-                if music_info:
-                    break
+            successful_source, music_info = await query_sources_concurrently(
+                resolve_sources(user_source, self._cfg["default_source"]), fetch_first, "[PlayMusicTool] "
+            )
+            if music_info:
+                logger.info(f"[PlayMusicTool] 在 {successful_source} 找到歌曲: {music_info.get('song')}")
 
             if not music_info:
                 return {"name": self.name, "content": f"❌ 未找到歌曲《{song_name}》，请尝试其他关键词或歌手名"}
@@ -6,15 +6,289 @@
 
 import aiohttp
 import asyncio
-import base64
-from typing import Tuple, Any
+import functools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Tuple, Any, Dict, List, Optional
 from src.common.logger import get_logger
 from src.plugin_system.base.base_tool import BaseTool, ToolParamType
 from src.plugin_system.base.base_command import BaseCommand
+from ..utils.api_client import AsyncAPIClient, get_shared_session, json_loads
+from ..utils.ttl_cache import TTLCache
 
 logger = get_logger("entertainment_plugin.news")
 
 
+# ===== 响应缓存 =====
+# 60秒新闻每天更新一次，历史上的今天按日期变化，AI资讯一天更新数次
+_NEWS_CACHE_TTL = 3600  # 1小时
+_HISTORY_CACHE_TTL = 86400  # 1天（按日期缓存，同一天的内容不变）
+_AI_NEWS_CACHE_TTL = 1800  # 30分钟
+_STALE_WHILE_REVALIDATE = 3600  # 缓存过期后此时间内仍直接返回旧数据，并在后台刷新
+_CN_TZ = timezone(timedelta(hours=8))  # 上游按北京时间划分日期
+
+_response_cache = TTLCache(maxsize=32, ttl=_NEWS_CACHE_TTL)  # {缓存键(默认为api_url): 响应数据}
+_stale_cache: Dict[str, dict] = {}  # 每个接口最近一次成功的响应（不过期），上游出错时兜底
+STALE_NOTICE = "⚠️ 数据可能不是最新\n\n"
+_inflight: Dict[str, asyncio.Task] = {}  # 进行中的上游请求，用于合并并发的相同请求
+_validators: Dict[str, Dict[str, str]] = {}  # 每个接口最近一次响应的 ETag/Last-Modified，用于条件请求
+_fetched_at: Dict[str, float] = {}  # 每个接口最近一次成功获取（含 304）的时间（time.monotonic）
+
+# 请求超时（模块级复用，避免每次请求构造 ClientTimeout）
+_API_TIMEOUT = aiohttp.ClientTimeout(total=10)
+_AI_NEWS_TIMEOUT = aiohttp.ClientTimeout(total=15)  # AI资讯接口响应较慢
+
+_image_client = AsyncAPIClient(timeout=15)  # 新闻图片下载（分块读取，带大小限制）
+_NEWS_IMAGE_MAX_SIZE = 20 * 1024 * 1024  # 60秒新闻为整版长图，远大于通用的 5MB 下载上限
+
+# 消息标题
+_NEWS_HEADER = "📰 每天60秒读懂世界\n\n"
+_NEWS_SIMPLE_HEADER = "每天60秒读懂世界\n\n"
+_HISTORY_HEADER = "📅 历史上的今天\n\n"
+_AI_NEWS_HEADER = "🤖 每日AI资讯\n\n"
+
+
+class NewsAPIError(Exception):
+    """新闻API请求失败（HTTP状态码异常或返回错误码）"""
+
+
+async def _fetch_json(
+    url: str,
+    timeout: aiohttp.ClientTimeout,
+    headers: Optional[Dict[str, str]] = None
+) -> Tuple[Optional[dict], Dict[str, str]]:
+    """
+    GET 请求并解析 JSON，非 2xx/304 状态码统一转为 NewsAPIError
+
+    Args:
+        url: 接口地址
+        timeout: 请求超时设置
+        headers: 额外请求头（条件请求的 If-None-Match / If-Modified-Since）
+
+    Returns:
+        (解析后的响应数据，304 未修改时为 None, 下次条件请求使用的请求头)
+    """
+    session = get_shared_session()
+    try:
+        async with session.get(
+            url, timeout=timeout, headers=headers, raise_for_status=True
+        ) as response:
+            if response.status == 304:
+                return None, headers or {}
+
+            validators = {}
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag:
+                validators["If-None-Match"] = etag
+            if last_modified:
+                validators["If-Modified-Since"] = last_modified
+
+            return json_loads(await response.read()), validators
+    except aiohttp.ClientResponseError as e:
+        raise NewsAPIError(f"HTTP状态码: {e.status}") from e
+
+
+async def _fetch_upstream(
+    url: str,
+    cache_key: str,
+    ttl: int,
+    timeout: aiohttp.ClientTimeout
+) -> dict:
+    """请求上游接口，成功后写入缓存"""
+    # 只有手上有旧数据时才发条件请求，否则 304 无内容可用
+    headers = _validators.get(url) if url in _stale_cache else None
+    data, validators = await _fetch_json(url, timeout, headers)
+
+    if data is None:
+        # 304：上游内容未变化，复用旧数据并刷新有效期
+        data = _stale_cache[url]
+        _response_cache.set(cache_key, data, ttl)
+        _fetched_at[url] = time.monotonic()
+        return data
+
+    if data.get("code") != 200:
+        raise NewsAPIError(data.get("message", "未知错误"))
+
+    _response_cache.set(cache_key, data, ttl)
+    _stale_cache[url] = data
+    _validators[url] = validators
+    _fetched_at[url] = time.monotonic()
+    return data
+
+
+def _on_fetch_done(cache_key: str, task: asyncio.Task):
+    """上游请求结束：移出进行中列表；后台刷新失败时记录日志（也避免未取回异常的警告）"""
+    _inflight.pop(cache_key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("后台刷新失败: %s, %s", cache_key, task.exception())
+
+
+async def _cached_fetch(
+    url: str,
+    ttl: int,
+    timeout: aiohttp.ClientTimeout,
+    cache_key: Optional[str] = None,
+    swr: int = 0
+) -> Tuple[dict, bool]:
+    """
+    获取接口数据（带缓存）
+
+    缓存有效期内直接返回缓存；否则请求上游，成功后写入缓存。
+    同一接口的并发请求合并为一次上游请求，其余调用者等待同一个结果。
+    缓存过期不超过 swr 秒时直接返回旧数据，上游请求在后台完成（stale-while-revalidate）。
+    上游失败时如果有上一次成功的数据，则返回该数据并标记为过期。
+
+    Args:
+        url: 接口地址
+        ttl: 缓存有效期（秒）
+        timeout: 请求超时设置
+        cache_key: 缓存键，默认使用接口地址
+        swr: 过期后仍可直接返回旧数据的时间（秒），0 表示不启用；
+            旧数据按接口地址保存，按日期等自定义缓存键缓存的接口不应启用
+
+    Returns:
+        (响应数据, 是否为过期数据)
+
+    Raises:
+        NewsAPIError: 上游返回错误且没有可用的过期数据
+        asyncio.TimeoutError: 请求超时且没有可用的过期数据
+    """
+    if cache_key is None:
+        cache_key = url
+
+    data = _response_cache.get(cache_key)
+    if data is not None:
+        return data, False
+
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_fetch_upstream(url, cache_key, ttl, timeout))
+        _inflight[cache_key] = task
+        task.add_done_callback(functools.partial(_on_fetch_done, cache_key))
+
+    if swr:
+        fetched_at = _fetched_at.get(url)
+        if fetched_at is not None and time.monotonic() - fetched_at < ttl + swr:
+            return _stale_cache[url], False
+
+    try:
+        # shield：某个调用者被取消时不影响其他等待同一请求的调用者
+        return await asyncio.shield(task), False
+    except Exception as e:
+        stale = _stale_cache.get(url)
+        if stale is None:
+            raise
+        logger.warning("请求失败，使用过期缓存: %s, %s: %s", url, type(e).__name__, e)
+        return stale, True
+
+
+def _history_cache_key(url: str) -> str:
+    """历史上的今天按日历日期缓存（北京时间），跨天后自动使用新的缓存键"""
+    today = datetime.now(_CN_TZ)
+    return f"{url}#{today.month:02d}-{today.day:02d}"
+
+
+# ===== 消息格式化 =====
+
+def _format_news(news_list: List[str]) -> str:
+    """格式化60秒新闻列表（带序号，不含标题）"""
+    return "\n".join("%d. %s" % (i, item) for i, item in enumerate(news_list, 1))
+
+
+def _format_news_simple(news_list: List[str], tip: str) -> str:
+    """60秒新闻 simple 格式：无 emoji、无微语"""
+    return _NEWS_SIMPLE_HEADER + _format_news(news_list)
+
+
+def _format_news_text(news_list: List[str], tip: str) -> str:
+    """60秒新闻 text 格式：带 emoji 标题和微语"""
+    message = _NEWS_HEADER + _format_news(news_list)
+    if tip:
+        message += f"\n\n💡 {tip}"
+    return message
+
+
+# format 参数 -> 格式化函数，未知格式按 text 处理
+_NEWS_FORMATTERS = {
+    "simple": _format_news_simple,
+    "text": _format_news_text,
+}
+
+
+def _format_history(events: List[dict]) -> str:
+    """格式化历史上的今天事件列表"""
+    return _HISTORY_HEADER + "\n".join(
+        f"• {event.get('year', '')}年 - {event.get('title', '')}" for event in events
+    )
+
+
+def _format_ai_news(news_list: List[dict]) -> str:
+    """格式化AI资讯列表（每条资讯之间空一行）"""
+    lines = []
+    for i, news in enumerate(news_list, 1):
+        lines.append(f"{i}. {news.get('title', '')}")
+        detail = news.get("detail", "")
+        source = news.get("source", "")
+        link = news.get("link", "")
+        if detail:
+            lines.append(f"   {detail}")
+        if source:
+            lines.append(f"   来源: {source}")
+        if link:
+            lines.append(f"   链接: {link}")
+        lines.append("")
+    return _AI_NEWS_HEADER + "\n".join(lines)
+
+
+# ===== 异常处理 =====
+
+def _tool_error_handler(subject: str):
+    """
+    Tool.execute 的统一异常处理：API错误/超时/其他异常转为对应的提示内容
+
+    Args:
+        subject: 提示中的查询对象，如 "新闻"
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            except NewsAPIError as e:
+                return {"name": self.name, "content": f"获取{subject}失败: {e}"}
+            except asyncio.TimeoutError:
+                return {"name": self.name, "content": f"获取{subject}超时，请稍后再试"}
+            except Exception as e:
+                logger.error("获取%s失败: %s", subject, e, exc_info=True)
+                return {"name": self.name, "content": f"获取{subject}失败: {str(e)}"}
+        return wrapper
+    return decorator
+
+
+def _command_error_handler(subject: str):
+    """
+    Command.execute 的统一异常处理：向用户发送失败提示并返回失败结果
+
+    Args:
+        subject: 提示中的查询对象，如 "新闻"
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            except NewsAPIError as e:
+                await self.send_text(f"获取{subject}失败，请稍后再试")
+                return False, f"API错误: {e}", True
+            except Exception as e:
+                logger.error("查询%s失败: %s", subject, e, exc_info=True)
+                await self.send_text(f"查询{subject}时出错了")
+                return False, str(e), True
+        return wrapper
+    return decorator
+
+
 class News60sTool(BaseTool):
     """获取60秒新闻的工具"""
 
@@ -25,61 +299,39 @@ class News60sTool(BaseTool):
     ]
     available_for_llm = True
 
+    @_tool_error_handler("新闻")
     async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
         """获取60秒新闻"""
+        # 获取可选参数
+        format_type = function_args.get("format", "text")
+
+        api_url = self.get_config(
+            "news.api_url",
+            "https://60s.7se.cn/v2/60s"
+        )
+
+        data, is_stale = await _cached_fetch(
+            api_url, _NEWS_CACHE_TTL, _API_TIMEOUT, swr=_STALE_WHILE_REVALIDATE
+        )
+
+        # 提取新闻内容
         try:
-            # 获取可选参数
-            format_type = function_args.get("format", "text")
-
-            api_url = self.get_config(
-                "news.api_url",
-                "https://60s.7se.cn/v2/60s"
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, timeout=10) as response:
-                    if response.status != 200:
-                        return {
-                            "name": self.name,
-                            "content": f"获取新闻失败，HTTP状态码: {response.status}"
-                        }
-
-                    data = await response.json()
-
-                    # 提取新闻内容
-                    if data.get("code") == 200:
-                        news_data = data.get("data", {})
-                        news_list = news_data.get("news", [])
-
-                        if not news_list:
-                            return {"name": self.name, "content": "暂无新闻数据"}
-
-                        # 格式化新闻内容
-                        news_text = "\n".join(
-                            [f"{i+1}. {item}" for i, item in enumerate(news_list)]
-                        )
-                        tip = news_data.get("tip", "")
-
-                        # 根据 format 参数决定输出格式
-                        if format_type == "simple":
-                            result = f"每天60秒读懂世界\n\n{news_text}"
-                        else:
-                            result = f"📰 每天60秒读懂世界\n\n{news_text}"
-                            if tip:
-                                result += f"\n\n💡 {tip}"
-
-                        return {"name": self.name, "content": result}
-                    else:
-                        return {
-                            "name": self.name,
-                            "content": f"获取新闻失败: {data.get('message', '未知错误')}"
-                        }
-
-        except asyncio.TimeoutError:
-            return {"name": self.name, "content": "获取新闻超时，请稍后再试"}
-        except Exception as e:
-            logger.error(f"获取60秒新闻失败: {e}", exc_info=True)
-            return {"name": self.name, "content": f"获取新闻失败: {str(e)}"}
+            news_data = data["data"]
+            news_list = news_data["news"]
+        except (KeyError, TypeError):
+            news_data, news_list = {}, []
+
+        if not news_list:
+            return {"name": self.name, "content": "暂无新闻数据"}
+
+        # 根据 format 参数选择格式化函数
+        formatter = _NEWS_FORMATTERS.get(format_type, _format_news_text)
+        result = formatter(news_list, news_data.get("tip", ""))
+
+        if is_stale:
+            result = STALE_NOTICE + result
+
+        return {"name": self.name, "content": result}
 
 
 class TodayInHistoryTool(BaseTool):
@@ -92,57 +344,43 @@ class TodayInHistoryTool(BaseTool):
     ]
     available_for_llm = True
 
+    @_tool_error_handler("历史事件")
     async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
         """获取历史上的今天"""
+        # 获取可选参数
+        limit = function_args.get("limit", 10)
+
+        api_url = self.get_config(
+            "news.history_api_url",
+            "https://60s.7se.cn/v2/today-in-history"
+        )
+
+        data, is_stale = await _cached_fetch(
+            api_url, _HISTORY_CACHE_TTL, _API_TIMEOUT, _history_cache_key(api_url)
+        )
+
+        # API 返回格式: {"data": {"date": "...", "items": [...]}}
         try:
-            # 获取可选参数
-            limit = function_args.get("limit", 10)
-
-            api_url = self.get_config(
-                "news.history_api_url",
-                "https://60s.7se.cn/v2/today-in-history"
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, timeout=10) as response:
-                    if response.status != 200:
-                        return {
-                            "name": self.name,
-                            "content": f"获取历史事件失败，HTTP状态码: {response.status}"
-                        }
-
-                    data = await response.json()
-
-                    if data.get("code") == 200:
-                        # API 返回格式: {"data": {"date": "...", "items": [...]}}
-                        data_obj = data.get("data", {})
-                        events = data_obj.get("items", []) if isinstance(data_obj, dict) else data_obj
-
-                        if not events:
-                            return {"name": self.name, "content": "暂无历史事件数据"}
-
-                        # 根据 limit 参数限制数量
-                        events = events[:limit]
-
-                        # 格式化历史事件
-                        result = "📅 历史上的今天\n\n"
-                        for event in events:
-                            year = event.get("year", "")
-                            title = event.get("title", "")
-                            result += f"• {year}年 - {title}\n"
-
-                        return {"name": self.name, "content": result.strip()}
-                    else:
-                        return {
-                            "name": self.name,
-                            "content": f"获取历史事件失败: {data.get('message', '未知错误')}"
-                        }
-
-        except asyncio.TimeoutError:
-            return {"name": self.name, "content": "获取历史事件超时，请稍后再试"}
-        except Exception as e:
-            logger.error(f"获取历史上的今天失败: {e}", exc_info=True)
-            return {"name": self.name, "content": f"获取历史事件失败: {str(e)}"}
+            events = data["data"]["items"]
+        except KeyError:
+            events = []
+        except TypeError:
+            # 兼容 data 直接为事件列表的格式
+            events = data.get("data") or []
+
+        if not events:
+            return {"name": self.name, "content": "暂无历史事件数据"}
+
+        # 根据 limit 参数限制数量
+        events = events[:limit]
+
+        # 格式化历史事件
+        result = _format_history(events)
+
+        if is_stale:
+            result = STALE_NOTICE + result
+
+        return {"name": self.name, "content": result.strip()}
 
 
 class AINewsTool(BaseTool):
@@ -155,64 +393,38 @@ class AINewsTool(BaseTool):
     ]
     available_for_llm = True
 
+    @_tool_error_handler("AI资讯")
     async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
         """获取每日AI资讯"""
+        limit = function_args.get("limit", 5)
+
+        api_url = self.get_config(
+            "news.ai_news_api_url",
+            "https://60s.7se.cn/v2/ai-news"
+        )
+
+        data, is_stale = await _cached_fetch(
+            api_url, _AI_NEWS_CACHE_TTL, _AI_NEWS_TIMEOUT, swr=_STALE_WHILE_REVALIDATE
+        )
+
         try:
-            limit = function_args.get("limit", 5)
-
-            api_url = self.get_config(
-                "news.ai_news_api_url",
-                "https://60s.7se.cn/v2/ai-news"
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, timeout=15) as response:
-                    if response.status != 200:
-                        return {
-                            "name": self.name,
-                            "content": f"获取AI资讯失败，HTTP状态码: {response.status}"
-                        }
-
-                    data = await response.json()
-
-                    if data.get("code") == 200:
-                        news_data = data.get("data", {})
-                        news_list = news_data.get("news", [])
-
-                        if not news_list:
-                            return {"name": self.name, "content": "暂无AI资讯数据"}
-
-                        # 限制数量
-                        news_list = news_list[:limit]
-
-                        # 格式化AI资讯
-                        result = "🤖 每日AI资讯\n\n"
-                        for i, news in enumerate(news_list, 1):
-                            title = news.get("title", "")
-                            detail = news.get("detail", "")
-                            source = news.get("source", "")
-                            link = news.get("link", "")
-                            result += f"{i}. {title}\n"
-                            if detail:
-                                result += f"   {detail}\n"
-                            if source:
-                                result += f"   来源: {source}\n"
-                            if link:
-                                result += f"   链接: {link}\n"
-                            result += "\n"
-
-                        return {"name": self.name, "content": result.strip()}
-                    else:
-                        return {
-                            "name": self.name,
-                            "content": f"获取AI资讯失败: {data.get('message', '未知错误')}"
-                        }
-
-        except asyncio.TimeoutError:
-            return {"name": self.name, "content": "获取AI资讯超时，请稍后再试"}
-        except Exception as e:
-            logger.error(f"获取AI资讯失败: {e}", exc_info=True)
-            return {"name": self.name, "content": f"获取AI资讯失败: {str(e)}"}
+            news_list = data["data"]["news"]
+        except (KeyError, TypeError):
+            news_list = []
+
+        if not news_list:
+            return {"name": self.name, "content": "暂无AI资讯数据"}
+
+        # 限制数量
+        news_list = news_list[:limit]
+
+        # 格式化AI资讯
+        result = _format_ai_news(news_list)
+
+        if is_stale:
+            result = STALE_NOTICE + result
+
+        return {"name": self.name, "content": result.strip()}
 
 
 class NewsCommand(BaseCommand):
@@ -220,66 +432,75 @@ class NewsCommand(BaseCommand):
 
     command_name = "news"
     command_description = "查询每天60秒读懂世界新闻"
-    command_pattern = r"^/(news|新闻)$"
+    command_pattern = r"^/(?:news|新闻)$"
     intercept_message = True
 
+    @_command_error_handler("新闻")
     async def execute(self) -> Tuple[bool, str, bool]:
         """执行新闻查询命令"""
+        api_url = self.get_config(
+            "news.api_url",
+            "https://60s.7se.cn/v2/60s"
+        )
+
+        data, is_stale = await _cached_fetch(
+            api_url, _NEWS_CACHE_TTL, _API_TIMEOUT, swr=_STALE_WHILE_REVALIDATE
+        )
+
         try:
-            api_url = self.get_config(
-                "news.api_url",
-                "https://60s.7se.cn/v2/60s"
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, timeout=10) as response:
-                    if response.status != 200:
-                        await self.send_text("获取新闻失败，请稍后再试")
-                        return False, f"HTTP错误: {response.status}", True
-
-                    data = await response.json()
-
-                    if data.get("code") == 200:
-                        news_data = data.get("data", {})
-                        news_list = news_data.get("news", [])
-                        tip = news_data.get("tip", "")
-                        image_url = news_data.get("image", "")
-
-                        if not news_list:
-                            await self.send_text("暂时没有新闻数据")
-                            return False, "无新闻数据", True
-
-                        # 发送图片
-                        if image_url and self.get_config("news.send_image", True):
-                            try:
-                                async with session.get(image_url, timeout=15) as img_response:
-                                    if img_response.status == 200:
-                                        image_data = await img_response.read()
-                                        image_base64 = base64.b64encode(image_data).decode()
-                                        await self.send_image(image_base64)
-                            except Exception as e:
-                                logger.warning(f"发送新闻图片失败: {e}")
-
-                        # 发送文本
-                        if self.get_config("news.send_text", True):
-                            news_text = "\n".join(
-                                [f"{i+1}. {item}" for i, item in enumerate(news_list)]
-                            )
-                            message = f"📰 每天60秒读懂世界\n\n{news_text}"
-                            if tip:
-                                message += f"\n\n💡 {tip}"
-
-                            await self.send_text(message)
-
-                        return True, "发送新闻成功", True
-                    else:
-                        await self.send_text("获取新闻失败")
-                        return False, f"API错误: {data.get('message')}", True
-
-        except Exception as e:
-            logger.error(f"查询新闻失败: {e}", exc_info=True)
-            await self.send_text("查询新闻时出错了")
-            return False, str(e), True
+            news_data = data["data"]
+            news_list = news_data["news"]
+        except (KeyError, TypeError):
+            news_data, news_list = {}, []
+        image_url = news_data.get("image", "")
+
+        if not news_list:
+            await self.send_text("暂时没有新闻数据")
+            return False, "无新闻数据", True
+
+        tasks = []
+        send_text = self.get_config("news.send_text", True)
+
+        # 发送文本
+        if send_text:
+            message = _format_news_text(news_list, news_data.get("tip", ""))
+            if is_stale:
+                message = STALE_NOTICE + message
+            tasks.append(self.send_text(message))
+
+        # 发送图片（下载较慢，与文本发送并行，文本无需等待图片下载完成）
+        if image_url and self.get_config("news.send_image", True):
+            tasks.append(self._send_news_image(image_url))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # 图片发送失败只记录日志；文本发送失败则交由统一异常处理返回失败
+        text_error = None
+        if send_text:
+            text_error, results = results[0], results[1:]
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("发送新闻图片失败: %s", result)
+        if isinstance(text_error, Exception):
+            raise text_error
+
+        return True, "发送新闻成功", True
+
+    async def _send_news_image(self, image_url: str):
+        """发送新闻图片（url 模式直接发送链接，否则下载后以 base64 发送）"""
+        if self.get_config("news.image_send_mode", "base64") == "url":
+            await self.send_custom("imageurl", image_url)
+            return
+
+        # 图片地址来自新闻接口本身，不检查 Content-Type（CDN 可能以 application/octet-stream 返回）
+        image_base64 = await _image_client.download_image_base64(
+            image_url,
+            max_size=_NEWS_IMAGE_MAX_SIZE,
+            log_prefix="[News]",
+            check_content_type=False
+        )
+        if image_base64:
+            await self.send_image(image_base64)
 
 
 class HistoryCommand(BaseCommand):
@@ -287,55 +508,46 @@ class HistoryCommand(BaseCommand):
 
     command_name = "history"
     command_description = "查询历史上的今天"
-    command_pattern = r"^/(history|历史)$"
+    command_pattern = r"^/(?:history|历史)$"
     intercept_message = True
 
+    @_command_error_handler("历史事件")
     async def execute(self) -> Tuple[bool, str, bool]:
         """执行历史查询命令"""
+        api_url = self.get_config(
+            "news.history_api_url",
+            "https://60s.7se.cn/v2/today-in-history"
+        )
+
+        data, is_stale = await _cached_fetch(
+            api_url, _HISTORY_CACHE_TTL, _API_TIMEOUT, _history_cache_key(api_url)
+        )
+
+        # API 返回格式: {"data": {"date": "...", "items": [...]}}
         try:
-            api_url = self.get_config(
-                "news.history_api_url",
-                "https://60s.7se.cn/v2/today-in-history"
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, timeout=10) as response:
-                    if response.status != 200:
-                        await self.send_text("获取历史事件失败，请稍后再试")
-                        return False, f"HTTP错误: {response.status}", True
-
-                    data = await response.json()
-
-                    if data.get("code") == 200:
-                        # API 返回格式: {"data": {"date": "...", "items": [...]}}
-                        data_obj = data.get("data", {})
-                        events = data_obj.get("items", []) if isinstance(data_obj, dict) else data_obj
-
-                        if not events:
-                            await self.send_text("暂时没有历史事件数据")
-                            return False, "无历史数据", True
-
-                        # 限制数量
-                        max_events = int(self.get_config("news.max_history_events", 10))
-                        events = events[:max_events]
-
-                        # 格式化
-                        message = "📅 历史上的今天\n\n"
-                        for event in events:
-                            year = event.get("year", "")
-                            title = event.get("title", "")
-                            message += f"• {year}年 - {title}\n"
-
-                        await self.send_text(message.strip())
-                        return True, "发送历史事件成功", True
-                    else:
-                        await self.send_text("获取历史事件失败")
-                        return False, f"API错误: {data.get('message')}", True
-
-        except Exception as e:
-            logger.error(f"查询历史事件失败: {e}", exc_info=True)
-            await self.send_text("查询历史事件时出错了")
-            return False, str(e), True
+            events = data["data"]["items"]
+        except KeyError:
+            events = []
+        except TypeError:
+            # 兼容 data 直接为事件列表的格式
+            events = data.get("data") or []
+
+        if not events:
+            await self.send_text("暂时没有历史事件数据")
+            return False, "无历史数据", True
+
+        # 限制数量
+        max_events = int(self.get_config("news.max_history_events", 10))
+        events = events[:max_events]
+
+        # 格式化
+        message = _format_history(events)
+
+        if is_stale:
+            message = STALE_NOTICE + message
+
+        await self.send_text(message.strip())
+        return True, "发送历史事件成功", True
 
 
 class AINewsCommand(BaseCommand):
@@ -343,60 +555,39 @@ class AINewsCommand(BaseCommand):
 
     command_name = "ainews"
     command_description = "查询每日AI资讯"
-    command_pattern = r"^/(ainews|ai新闻|AI新闻|ai资讯|AI资讯)$"
+    command_pattern = r"^/(?:ainews|(?:ai|AI)(?:新闻|资讯))$"
     intercept_message = True
 
+    @_command_error_handler("AI资讯")
     async def execute(self) -> Tuple[bool, str, bool]:
         """执行AI资讯查询命令"""
+        api_url = self.get_config(
+            "news.ai_news_api_url",
+            "https://60s.7se.cn/v2/ai-news"
+        )
+
+        data, is_stale = await _cached_fetch(
+            api_url, _AI_NEWS_CACHE_TTL, _AI_NEWS_TIMEOUT, swr=_STALE_WHILE_REVALIDATE
+        )
+
         try:
-            api_url = self.get_config(
-                "news.ai_news_api_url",
-                "https://60s.7se.cn/v2/ai-news"
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, timeout=15) as response:
-                    if response.status != 200:
-                        await self.send_text("获取AI资讯失败，请稍后再试")
-                        return False, f"HTTP错误: {response.status}", True
-
-                    data = await response.json()
-
-                    if data.get("code") == 200:
-                        news_data = data.get("data", {})
-                        news_list = news_data.get("news", [])
-
-                        if not news_list:
-                            await self.send_text("暂时没有AI资讯数据")
-                            return False, "无AI资讯数据", True
-
-                        # 限制数量
-                        max_news = int(self.get_config("news.max_ai_news", 5))
-                        news_list = news_list[:max_news]
-
-                        # 格式化
-                        message = "🤖 每日AI资讯\n\n"
-                        for i, news in enumerate(news_list, 1):
-                            title = news.get("title", "")
-                            detail = news.get("detail", "")
-                            source = news.get("source", "")
-                            link = news.get("link", "")
-                            message += f"{i}. {title}\n"
-                            if detail:
-                                message += f"   {detail}\n"
-                            if source:
-                                message += f"   来源: {source}\n"
-                            if link:
-                                message += f"   链接: {link}\n"
-                            message += "\n"
-
-                        await self.send_text(message.strip())
-                        return True, "发送AI资讯成功", True
-                    else:
-                        await self.send_text("获取AI资讯失败")
-                        return False, f"API错误: {data.get('message')}", True
-
-        except Exception as e:
-            logger.error(f"查询AI资讯失败: {e}", exc_info=True)
-            await self.send_text("查询AI资讯时出错了")
-            return False, str(e), True
+            news_list = data["data"]["news"]
+        except (KeyError, TypeError):
+            news_list = []
+
+        if not news_list:
+            await self.send_text("暂时没有AI资讯数据")
+            return False, "无AI资讯数据", True
+
+        # 限制数量
+        max_news = int(self.get_config("news.max_ai_news", 5))
+        news_list = news_list[:max_news]
+
+        # 格式化
+        message = _format_ai_news(news_list)
+
+        if is_stale:
+            message = STALE_NOTICE + message
+
+        await self.send_text(message.strip())
+        return True, "发送AI资讯成功", True
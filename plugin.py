@@ -14,25 +14,6 @@ from src.plugin_system import (
 from src.plugin_system.base.config_types import ConfigSection, ConfigLayout, ConfigTab
 from src.common.logger import get_logger
 
-# 导入各个模块的组件
-from .modules.image_module import RandomImageAction, RandomImageCommand
-from .modules.news_module import (
-    News60sTool,
-    TodayInHistoryTool,
-    AINewsTool,
-    NewsCommand,
-    HistoryCommand,
-    AINewsCommand
-)
-from .modules.music_module import (
-    PlayMusicTool,
-    MusicCommand,
-    ChooseCommand,
-    QuickChooseCommand
-)
-from .modules.ai_draw_module import AIDrawCommand
-from .modules.auto_image_tool import AIDrawTool  # 统一的AI绘图工具
-
 logger = get_logger("entertainment_plugin")
 
 
@@ -187,6 +168,11 @@ class EntertainmentPlugin(BasePlugin):
                 default=True,
                 description="是否发送60秒新闻图片"
             ),
+            "image_send_mode": ConfigField(
+                type=str,
+                default="base64",
+                description="新闻图片发送方式 (base64=下载后以base64发送, url=直接发送图片链接，无需下载)"
+            ),
             "send_text": ConfigField(
                 type=bool,
                 default=True,
@@ -239,6 +225,11 @@ class EntertainmentPlugin(BasePlugin):
                 default=True,
                 description="是否显示专辑封面"
             ),
+            "cover_send_mode": ConfigField(
+                type=str,
+                default="base64",
+                description="专辑封面发送方式 (base64=下载后以base64发送, url=直接发送封面链接，无需下载)"
+            ),
             "show_info_text": ConfigField(
                 type=bool,
                 default=True,
@@ -253,6 +244,11 @@ class EntertainmentPlugin(BasePlugin):
                 type=bool,
                 default=True,
                 description="是否启用数字快捷选择（直接输入1-10选歌）"
+            ),
+            "prefetch_first_detail": ConfigField(
+                type=bool,
+                default=False,
+                description="搜索成功后是否在后台预取第1首的详情（选歌更快，但每次搜索多一次上游请求）"
             )
         },
         "ai_draw": {
@@ -283,17 +279,7 @@ class EntertainmentPlugin(BasePlugin):
         """返回插件组件列表"""
         components = []
 
-        # 启动缓存清理任务（防止内存泄漏）
-        try:
-            from .modules.music_module import start_cache_cleanup
-            from .modules.ai_draw_module import start_image_cache_cleanup
-            start_cache_cleanup()
-            start_image_cache_cleanup()
-            logger.info("缓存清理任务已启动")
-        except Exception as e:
-            logger.warning(f"启动缓存清理任务失败: {e}")
-
-        # 根据配置启用相应模块
+        # 根据配置启用相应模块（各模块在启用时才导入，未启用的模块不加载其依赖）
         try:
             image_enabled = self.get_config("modules.image_enabled", True)
             news_enabled = self.get_config("modules.news_enabled", True)
@@ -308,12 +294,23 @@ class EntertainmentPlugin(BasePlugin):
 
         # 看看腿模块
         if image_enabled:
+            from .modules.image_module import RandomImageAction, RandomImageCommand
+
             components.append((RandomImageAction.get_action_info(), RandomImageAction))
             components.append((RandomImageCommand.get_command_info(), RandomImageCommand))
             logger.info("已启用看看腿模块")
 
         # 新闻模块
         if news_enabled:
+            from .modules.news_module import (
+                News60sTool,
+                TodayInHistoryTool,
+                AINewsTool,
+                NewsCommand,
+                HistoryCommand,
+                AINewsCommand
+            )
+
             components.append((News60sTool.get_tool_info(), News60sTool))
             components.append((TodayInHistoryTool.get_tool_info(), TodayInHistoryTool))
             components.append((AINewsTool.get_tool_info(), AINewsTool))
@@ -324,6 +321,13 @@ class EntertainmentPlugin(BasePlugin):
 
         # 音乐模块
         if music_enabled:
+            from .modules.music_module import (
+                PlayMusicTool,
+                MusicCommand,
+                ChooseCommand,
+                QuickChooseCommand
+            )
+
             components.append((PlayMusicTool.get_tool_info(), PlayMusicTool))
             components.append((MusicCommand.get_command_info(), MusicCommand))
             components.append((ChooseCommand.get_command_info(), ChooseCommand))
@@ -332,6 +336,17 @@ class EntertainmentPlugin(BasePlugin):
 
         # AI绘图模块
         if ai_draw_enabled:
+            from .modules.ai_draw_module import AIDrawCommand, start_image_cache_cleanup
+            from .modules.auto_image_tool import AIDrawTool  # 统一的AI绘图工具
+
+            # 启动图片缓存清理任务（防止内存泄漏）
+            # 音乐搜索缓存由写入时安排的定时器自动过期，无需后台轮询
+            try:
+                start_image_cache_cleanup()
+                logger.info("缓存清理任务已启动")
+            except Exception as e:
+                logger.warning(f"启动缓存清理任务失败: {e}")
+
             components.append((AIDrawCommand.get_command_info(), AIDrawCommand))
             # 统一的AI绘图工具（支持主动画图、自动配图、换风格）
             components.append((AIDrawTool.get_tool_info(), AIDrawTool))
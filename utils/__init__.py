@@ -1,10 +1,20 @@
 """共用工具模块"""
 
-from .api_client import AsyncAPIClient
-from .image_generator import generate_music_list_image, generate_music_list_text
+from .api_client import AsyncAPIClient, get_shared_session, json_loads, b64encode
+from .image_generator import (
+    generate_music_list_image,
+    generate_music_list_image_async,
+    generate_music_list_text,
+)
+from .ttl_cache import TTLCache
 
 __all__ = [
     'AsyncAPIClient',
+    'get_shared_session',
+    'json_loads',
+    'b64encode',
     'generate_music_list_image',
+    'generate_music_list_image_async',
     'generate_music_list_text',
+    'TTLCache',
 ]
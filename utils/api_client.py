@@ -7,11 +7,84 @@
 import aiohttp
 import asyncio
 import base64
-from typing import Optional, Dict, Any, List
+import json
+import random
+from typing import Optional, Dict, Any, List, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
 from src.common.logger import get_logger
 
 logger = get_logger("entertainment_plugin.api_client")
 
+_MAX_RETRY_DELAY = 30.0  # 重试等待上限（秒）
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    解析 JSON（已安装 orjson 时使用 orjson，直接接受 bytes，无需先解码为 str）
+
+    Args:
+        data: JSON 原始字节或字符串
+
+    Returns:
+        解析结果
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def b64encode(data: Union[bytes, bytearray, memoryview]) -> str:
+    """
+    base64 编码（已安装 pybase64 时使用其 SIMD 加速实现）
+
+    Args:
+        data: 原始字节（支持任意 bytes-like 对象，无需先复制为 bytes）
+
+    Returns:
+        base64 字符串
+    """
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64encode(data).decode('ascii')
+    return base64.b64encode(data).decode('ascii')
+
+
+# ===== 共享 ClientSession =====
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    获取全局共享的 ClientSession（懒加载）
+
+    所有请求复用同一个连接池，避免每次请求都重新建立 TCP/TLS 连接
+
+    Returns:
+        共享的 aiohttp.ClientSession
+    """
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                keepalive_timeout=75,
+                ttl_dns_cache=300
+            )
+        )
+    return _shared_session
+
 
 class AsyncAPIClient:
     """异步 API 客户端"""
@@ -24,6 +97,7 @@ class AsyncAPIClient:
             timeout: 请求超时时间（秒）
         """
         self.timeout = timeout
+        self._client_timeout = aiohttp.ClientTimeout(total=timeout)  # 每个实例只构造一次
 
     async def get_json(
         self,
@@ -40,7 +114,7 @@ class AsyncAPIClient:
             url: 请求 URL
             params: 查询参数
             retries: 重试次数
-            base_delay: 基础延迟时间（指数退避）
+            base_delay: 基础延迟时间（指数退避，带 ±20% 随机抖动）
             log_prefix: 日志前缀
 
         Returns:
@@ -48,19 +122,24 @@ class AsyncAPIClient:
         """
         for attempt in range(1, retries + 1):
             try:
-                async with aiohttp.ClientSession(
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as session:
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            logger.info(f"{log_prefix} 请求成功: {url}")
-                            return data
-                        else:
-                            logger.warning(
-                                f"{log_prefix} 请求失败 (尝试 {attempt}/{retries}), "
-                                f"状态码: {response.status}"
-                            )
+                session = get_shared_session()
+                async with session.get(
+                    url,
+                    params=params,
+                    timeout=self._client_timeout
+                ) as response:
+                    if response.status == 200:
+                        data = json_loads(await response.read())
+                        logger.info(f"{log_prefix} 请求成功: {url}")
+                        return data
+                    else:
+                        logger.warning(
+                            f"{log_prefix} 请求失败 (尝试 {attempt}/{retries}), "
+                            f"状态码: {response.status}"
+                        )
+                        # 4xx（429 限流除外）是请求本身的问题，重试无意义
+                        if 400 <= response.status < 500 and response.status != 429:
+                            return None
 
             except asyncio.TimeoutError:
                 logger.error(f"{log_prefix} 请求超时 (尝试 {attempt}/{retries})")
@@ -70,9 +149,10 @@ class AsyncAPIClient:
                     f"{type(e).__name__}: {e}"
                 )
 
-            # 指数退避重试
+            # 指数退避重试（加随机抖动，避免并发请求同时重试）
             if attempt < retries:
-                delay = base_delay * (2 ** (attempt - 1))
+                delay = min(base_delay * (2 ** (attempt - 1)), _MAX_RETRY_DELAY)
+                delay *= random.uniform(0.8, 1.2)
                 logger.info(f"{log_prefix} 等待 {delay:.1f}秒后重试...")
                 await asyncio.sleep(delay)
 
@@ -83,7 +163,8 @@ class AsyncAPIClient:
         self,
         url: str,
         max_size: int = 5 * 1024 * 1024,
-        log_prefix: str = "[ImageDownload]"
+        log_prefix: str = "[ImageDownload]",
+        check_content_type: bool = True
     ) -> Optional[str]:
         """
         下载图片并转为 base64
@@ -92,44 +173,50 @@ class AsyncAPIClient:
             url: 图片 URL
             max_size: 最大文件大小（字节）
             log_prefix: 日志前缀
+            check_content_type: 是否要求 Content-Type 为 image/*（可信的固定接口可关闭，
+                部分 CDN 以 application/octet-stream 返回图片）
 
         Returns:
             base64 编码的图片，失败返回 None
         """
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        logger.warning(
-                            f"{log_prefix} 下载失败，状态码: {response.status}"
-                        )
-                        return None
-
-                    # 检查内容类型
+            session = get_shared_session()
+            async with session.get(
+                url,
+                timeout=self._client_timeout
+            ) as response:
+                if response.status != 200:
+                    logger.warning(
+                        f"{log_prefix} 下载失败，状态码: {response.status}"
+                    )
+                    return None
+
+                # 检查内容类型
+                if check_content_type:
                     content_type = response.headers.get('Content-Type', '')
                     if not content_type.startswith('image/'):
                         logger.warning(f"{log_prefix} 非图片类型: {content_type}")
                         return None
 
-                    # 检查文件大小
-                    content_length = response.headers.get('Content-Length')
-                    if content_length and int(content_length) > max_size:
-                        logger.warning(
-                            f"{log_prefix} 文件过大: {int(content_length)} > {max_size}"
-                        )
-                        return None
-
-                    # 读取内容
-                    content = await response.read()
+                # 检查文件大小
+                content_length = response.headers.get('Content-Length')
+                if content_length and int(content_length) > max_size:
+                    logger.warning(
+                        f"{log_prefix} 文件过大: {int(content_length)} > {max_size}"
+                    )
+                    return None
+
+                # 分块读取内容，超出大小限制时立即停止
+                content = bytearray()
+                async for chunk in response.content.iter_chunked(65536):
+                    content.extend(chunk)
                     if len(content) > max_size:
                         logger.warning(
-                            f"{log_prefix} 实际内容过大: {len(content)} > {max_size}"
+                            f"{log_prefix} 实际内容过大: >{max_size}"
                         )
                         return None
 
-                    return base64.b64encode(content).decode('utf-8')
+                return b64encode(content)
 
         except asyncio.TimeoutError:
             logger.warning(f"{log_prefix} 下载超时: {url[:50]}")
@@ -5,8 +5,9 @@
 """
 
 import os
-import base64
-from typing import List, Optional
+import asyncio
+import functools
+from typing import List, Optional, Tuple
 
 try:
     import io
@@ -16,9 +17,142 @@ except ImportError:
     PIL_AVAILABLE = False
 
 from src.common.logger import get_logger
+from .api_client import b64encode
+from .ttl_cache import TTLCache
 
 logger = get_logger("entertainment_plugin.image_generator")
 
+# 已生成的列表图片：{(关键词, 音乐源, 各歌曲字段): base64}，重复搜索时直接复用
+# 只在事件循环线程中读写（见 generate_music_list_image_async），无需加锁
+_image_cache = TTLCache(maxsize=32, ttl=600)
+
+# 列表图片最多绘制的歌曲数（图片高度与编码耗时随行数线性增长）
+MAX_IMAGE_ITEMS = 30
+
+# PNG 的 zlib 压缩级别（0-9）：纯色块为主的卡片用最快的 1 级即可，体积增加有限
+PNG_COMPRESS_LEVEL = 1
+
+
+# 支持中文的字体候选路径（按优先级）
+_CHINESE_FONT_PATHS = (
+    # Windows 常用字体
+    r"C:\\Windows\\Fonts\\msyh.ttc",
+    r"C:\\Windows\\Fonts\\msyh.ttf",
+    r"C:\\Windows\\Fonts\\msyhbd.ttf",
+    r"C:\\Windows\\Fonts\\simhei.ttf",
+    r"C:\\Windows\\Fonts\\simsun.ttc",
+    r"C:\\Windows\\Fonts\\simsun.ttf",
+    # Linux Noto CJK fonts
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    # WenQuanYi fonts
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    # Droid fonts
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+    # macOS
+    "/System/Library/Fonts/PingFang.ttc",
+    "/usr/share/fonts/truetype/arphic/uming.ttc",
+)
+
+# Windows 字体目录中识别中文字体的文件名关键字
+_CHINESE_FONT_KEYWORDS = (
+    'msyh', 'simhei', 'simsun', 'noto',
+    'yahei', 'pingfang', 'uming', 'wqy'
+)
+
+
+def _find_font_path() -> Optional[str]:
+    """
+    查找支持中文的字体文件
+
+    Returns:
+        字体路径，未找到返回 None
+    """
+    # 先按常见路径查找
+    for path in _CHINESE_FONT_PATHS:
+        try:
+            if os.path.exists(path):
+                logger.info(f"[ImageGen] 找到中文字体: {path}")
+                return path
+        except Exception:
+            continue
+
+    # 如果还没找到，在 Windows 上扫描字体目录
+    if os.name == 'nt':
+        try:
+            windows_fonts_dir = os.path.join(
+                os.environ.get('WINDIR', r"C:\\Windows"), 'Fonts'
+            )
+            if os.path.isdir(windows_fonts_dir):
+                # scandir 的目录项自带文件类型信息，无需再逐个 stat 确认
+                with os.scandir(windows_fonts_dir) as entries:
+                    for entry in entries:
+                        lower = entry.name.lower()
+                        if any(k in lower for k in _CHINESE_FONT_KEYWORDS) and entry.is_file():
+                            logger.info(
+                                f"[ImageGen] 在 Windows 字体目录找到中文字体: "
+                                f"{entry.path}"
+                            )
+                            return entry.path
+        except Exception as e:
+            logger.debug(f"[ImageGen] Windows 字体扫描失败: {e}")
+
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_fonts() -> Optional[tuple]:
+    """
+    加载列表图片所需的三种字号字体（进程内只查找、解析一次字体文件）
+
+    Returns:
+        (标题字体, 正文字体, 小字体)，未找到字体或加载失败返回 None
+    """
+    font_path = _find_font_path()
+    if not font_path:
+        return None
+
+    try:
+        return (
+            ImageFont.truetype(font_path, 28),
+            ImageFont.truetype(font_path, 18),
+            ImageFont.truetype(font_path, 14),
+        )
+    except Exception as e:
+        logger.error(f"[ImageGen] 加载字体失败: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def _render_footer(width: int, height: int, padding: int, font) -> "Image.Image":
+    """
+    绘制底部提示栏（内容固定，同一尺寸和字体只绘制一次，之后直接粘贴）
+
+    Args:
+        width: 底栏宽度
+        height: 底栏高度
+        padding: 文字左边距
+        font: 提示文字字体
+
+    Returns:
+        底栏图片
+    """
+    footer = Image.new('RGB', (width, height), color='#333333')
+    ImageDraw.Draw(footer).text(
+        (padding, 10),
+        "提示: 使用 /choose <序号> 选择歌曲",
+        font=font,
+        fill='white'
+    )
+    return footer
+
+
+def _song_fields(music: dict) -> Tuple[str, str, str]:
+    """提取歌名、歌手、专辑（缺失时为"未知"）"""
+    get = music.get
+    return get('song', '未知'), get('singer', '未知'), get('album', '未知')
+
 
 def generate_music_list_image(
     music_list: List[dict],
@@ -26,7 +160,7 @@ def generate_music_list_image(
     source_name: str = ""
 ) -> Optional[str]:
     """
-    生成歌曲列表图片
+    生成歌曲列表图片（最多绘制前 MAX_IMAGE_ITEMS 首）
 
     Args:
         music_list: 歌曲列表
@@ -41,66 +175,15 @@ def generate_music_list_image(
         return None
 
     try:
-        # 查找支持中文的字体
-        chinese_font_paths = [
-            # Windows 常用字体
-            r"C:\\Windows\\Fonts\\msyh.ttc",
-            r"C:\\Windows\\Fonts\\msyh.ttf",
-            r"C:\\Windows\\Fonts\\msyhbd.ttf",
-            r"C:\\Windows\\Fonts\\simhei.ttf",
-            r"C:\\Windows\\Fonts\\simsun.ttc",
-            r"C:\\Windows\\Fonts\\simsun.ttf",
-            # Linux Noto CJK fonts
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-            # WenQuanYi fonts
-            "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
-            "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
-            # Droid fonts
-            "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
-            # macOS
-            "/System/Library/Fonts/PingFang.ttc",
-            "/usr/share/fonts/truetype/arphic/uming.ttc",
-        ]
-
-        font_path = None
-        # 先按常见路径查找
-        for path in chinese_font_paths:
-            try:
-                if os.path.exists(path):
-                    font_path = path
-                    logger.info(f"[ImageGen] 找到中文字体: {path}")
-                    break
-            except Exception:
-                continue
-
-        # 如果还没找到，在 Windows 上扫描字体目录
-        if not font_path and os.name == 'nt':
-            try:
-                windows_fonts_dir = os.path.join(
-                    os.environ.get('WINDIR', r"C:\\Windows"), 'Fonts'
-                )
-                if os.path.isdir(windows_fonts_dir):
-                    for fname in os.listdir(windows_fonts_dir):
-                        lower = fname.lower()
-                        if any(k in lower for k in (
-                            'msyh', 'simhei', 'simsun', 'noto',
-                            'yahei', 'pingfang', 'uming', 'wqy'
-                        )):
-                            candidate = os.path.join(windows_fonts_dir, fname)
-                            if os.path.exists(candidate):
-                                font_path = candidate
-                                logger.info(
-                                    f"[ImageGen] 在 Windows 字体目录找到中文字体: "
-                                    f"{candidate}"
-                                )
-                                break
-            except Exception as e:
-                logger.debug(f"[ImageGen] Windows 字体扫描失败: {e}")
-
-        if not font_path:
+        fonts = _load_fonts()
+        if fonts is None:
             logger.warning("[ImageGen] 未找到支持中文的字体，无法生成图片列表")
             return None
+        title_font, text_font, small_font = fonts
+
+        # 超出上限的部分不绘制，避免超长图片拖慢绘制和编码
+        total = len(music_list)
+        music_list = music_list[:MAX_IMAGE_ITEMS]
 
         # 图片设置
         width = 800
@@ -114,24 +197,18 @@ def generate_music_list_image(
         img = Image.new('RGB', (width, height), color='#F5F5F5')
         draw = ImageDraw.Draw(img)
 
-        try:
-            # 加载中文字体
-            title_font = ImageFont.truetype(font_path, 28)
-            text_font = ImageFont.truetype(font_path, 18)
-            small_font = ImageFont.truetype(font_path, 14)
-        except Exception as e:
-            logger.error(f"[ImageGen] 加载字体失败: {e}")
-            return None
-
         # 绘制头部
         draw.rectangle([0, 0, width, header_height], fill='#1DB954')
         title_text = f"搜索结果: {search_keyword}"
         if source_name:
             title_text += f" [{source_name}]"
         draw.text((padding, 30), title_text, font=title_font, fill='white')
+        count_text = f"找到 {total} 首歌曲"
+        if total > len(music_list):
+            count_text += f"（显示前 {len(music_list)} 首）"
         draw.text(
             (padding, 70),
-            f"找到 {len(music_list)} 首歌曲，输入 /choose 序号 来选择",
+            f"{count_text}，输入 /choose 序号 来选择",
             font=small_font,
             fill='white'
         )
@@ -146,43 +223,73 @@ def generate_music_list_image(
             # 序号
             draw.text((padding, y + 10), f"#{idx}", font=text_font, fill='#1DB954')
 
-            # 歌曲信息
-            song = music.get('song', '未知')[:25]
-            singer = music.get('singer', '未知')[:20]
-            album = music.get('album', '未知')[:20]
+            # 歌曲信息（歌名截断25字，歌手、专辑各截断20字）
+            song, singer, album = _song_fields(music)
 
-            draw.text((padding + 50, y + 10), song, font=text_font, fill='#333333')
+            draw.text((padding + 50, y + 10), song[:25], font=text_font, fill='#333333')
             draw.text(
                 (padding + 50, y + 40),
-                f"{singer} - {album}",
+                "%.20s - %.20s" % (singer, album),
                 font=small_font,
                 fill='#666666'
             )
 
             y += item_height
 
-        # 绘制底部
-        draw.rectangle([0, height - footer_height, width, height], fill='#333333')
-        draw.text(
-            (padding, height - 30),
-            "提示: 使用 /choose <序号> 选择歌曲",
-            font=small_font,
-            fill='white'
-        )
+        # 绘制底部（固定内容，使用缓存的底栏）
+        img.paste(_render_footer(width, footer_height, padding, small_font), (0, height - footer_height))
 
         # 转换为 base64
         buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        img.save(buffer, format='PNG', optimize=False, compress_level=PNG_COMPRESS_LEVEL)
+        # getbuffer() 直接引用内部缓冲区，避免 getvalue() 再复制一份 PNG 数据
+        with buffer.getbuffer() as png_view:
+            img_base64 = b64encode(png_view)
 
-        logger.info(f"[ImageGen] 成功生成歌曲列表图片，共 {len(music_list)} 首歌")
+        logger.info("[ImageGen] 成功生成歌曲列表图片，共 %d 首歌", total)
         return img_base64
 
     except Exception as e:
-        logger.error(f"[ImageGen] 生成歌曲列表图片失败: {e}", exc_info=True)
+        logger.error("[ImageGen] 生成歌曲列表图片失败: %s", e, exc_info=True)
         return None
 
 
+async def generate_music_list_image_async(
+    music_list: List[dict],
+    search_keyword: str,
+    source_name: str = ""
+) -> Optional[str]:
+    """
+    在线程池中生成歌曲列表图片（Pillow 绘制与 PNG 编码为 CPU 密集操作，避免阻塞事件循环）
+
+    相同关键词、音乐源和歌曲列表的图片会被缓存，重复搜索时不再重新绘制
+
+    Args:
+        music_list: 歌曲列表
+        search_keyword: 搜索关键词
+        source_name: 音乐源名称
+
+    Returns:
+        base64 编码的图片，失败或 PIL 不可用返回 None
+    """
+    # 上游字段可能是列表/字典等不可哈希的值，统一转为字符串作为缓存键
+    key = (
+        search_keyword,
+        source_name,
+        tuple(tuple(map(str, _song_fields(music))) for music in music_list),
+    )
+    img_base64 = _image_cache.get(key)
+    if img_base64 is not None:
+        return img_base64
+
+    img_base64 = await asyncio.to_thread(
+        generate_music_list_image, music_list, search_keyword, source_name
+    )
+    if img_base64:
+        _image_cache.set(key, img_base64)
+    return img_base64
+
+
 def generate_music_list_text(
     music_list: List[dict],
     search_keyword: str,
@@ -199,22 +306,16 @@ def generate_music_list_text(
     Returns:
         格式化的文本列表
     """
-    text = f"🎵 搜索结果：{search_keyword}"
+    header = f"🎵 搜索结果：{search_keyword}"
     if source_name:
-        text += f" [{source_name}]"
-    text += f"\n找到 {len(music_list)} 首歌曲\n"
-    text += "=" * 40 + "\n\n"
-
-    for idx, music in enumerate(music_list, 1):
-        song = music.get('song', '未知')
-        singer = music.get('singer', '未知')
-        album = music.get('album', '未知')
-
-        text += f"#{idx}  {song}\n"
-        text += f"     歌手: {singer}\n"
-        text += f"     专辑: {album}\n\n"
+        header += f" [{source_name}]"
 
-    text += "=" * 40 + "\n"
-    text += "💡 输入 /choose <序号> 来选择歌曲"
+    parts = [header, f"\n找到 {len(music_list)} 首歌曲\n", "=" * 40, "\n\n"]
+    parts.extend(
+        f"#{idx}  {song}\n     歌手: {singer}\n     专辑: {album}\n\n"
+        for idx, (song, singer, album) in enumerate(map(_song_fields, music_list), 1)
+    )
+    parts.append("=" * 40)
+    parts.append("\n💡 输入 /choose <序号> 来选择歌曲")
 
-    return text
+    return "".join(parts)
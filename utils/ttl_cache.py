@@ -0,0 +1,144 @@
+"""
+TTL 缓存工具
+
+带过期时间和容量上限的内存缓存，统一处理过期检查与 LRU 淘汰
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    带过期时间的 LRU 缓存
+
+    - 每个条目记录过期时间戳，读取时自动检查并删除过期条目
+    - 超出容量时淘汰最久未使用的条目
+    - lru=False 时为写入顺序模式：读取不调整顺序，最早写入的条目在最前；
+      所有条目使用相同 ttl 时即按过期时间排序，清理过期条目只需从头部检查
+    - 本身不加锁，需要跨 await 保证一致性时由调用方加锁
+    """
+
+    def __init__(self, maxsize: int, ttl: float, lru: bool = True):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最大条目数
+            ttl: 默认存活时间（秒）
+            lru: 是否在读取时刷新条目顺序；为 False 时按写入顺序排列，
+                此时不应为单个条目指定不同的 ttl
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lru = lru
+        # {key: (expiry_ts, value)}，LRU 模式按最近使用排序，写入顺序模式按写入时间排序，最旧的在最前
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """只检查键是否存在（不检查过期），用于廉价的预判"""
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存值，过期则删除并返回默认值
+
+        Args:
+            key: 缓存键
+            default: 不存在或已过期时的返回值
+
+        Returns:
+            缓存值或默认值
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expiry, value = entry
+        if time.time() >= expiry:
+            del self._data[key]
+            return default
+
+        if self.lru:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        写入缓存，顺带淘汰头部过期条目，超出容量时淘汰最前面（最久未使用/最早写入）的条目
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 本条目的存活时间（秒），默认使用初始化时的 ttl
+        """
+        now = time.time()
+        self._evict_expired_front(now)
+
+        self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """删除并返回缓存值（不检查过期）"""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        """清空缓存"""
+        self._data.clear()
+
+    def evict_expired(self) -> int:
+        """
+        清理所有过期条目
+
+        Returns:
+            清理的条目数
+        """
+        now = time.time()
+        if not self.lru:
+            # 写入顺序模式下头部即最早过期的条目
+            return self._evict_expired_front(now)
+
+        expired_keys = [key for key, (expiry, _) in self._data.items() if now >= expiry]
+        for key in expired_keys:
+            del self._data[key]
+        return len(expired_keys)
+
+    def next_expiry(self) -> Optional[float]:
+        """
+        获取最早的过期时间戳
+
+        Returns:
+            时间戳，缓存为空时返回 None
+        """
+        if not self._data:
+            return None
+        if not self.lru:
+            return next(iter(self._data.values()))[0]
+        return min(expiry for expiry, _ in self._data.values())
+
+    def _evict_expired_front(self, now: float) -> int:
+        """
+        从头部依次淘汰过期条目，遇到未过期条目即停止
+
+        写入顺序模式下可清理全部过期条目；LRU 模式或条目 ttl 不同时头部不一定最早过期，
+        只是顺带清理，剩余的过期条目在读取时删除
+
+        Returns:
+            清理的条目数
+        """
+        evicted = 0
+        while self._data:
+            expiry, _ = next(iter(self._data.values()))
+            if now < expiry:
+                break
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted